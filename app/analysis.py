@@ -0,0 +1,264 @@
+# app/analysis.py
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+from app import rollups
+from app.cache import resume_cache, sha256_text
+from app.candidates import candidate_index
+from app.job_candidates import job_candidates
+from app.config import settings
+from app.db import db
+from app.extraction import extractor, ExtractionBusy
+from app.matching import vectorize
+from app.storage import excerpt_of, fetch_original, save_text, store_original
+from app.skills import skill_matcher
+from app.utils import score_jds_with_source
+
+logger = logging.getLogger(__name__)
+
+# Resume analysis jobs live in `resume_jobs`:
+#   queued -> running -> done | failed
+# A running job holds a lease; if its worker dies the lease expires and
+# any worker (in any process) can claim it again.
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+TERMINAL = (DONE, FAILED)
+
+
+class RetryLater(Exception):
+    """Transient failure; the job goes back to the queue without counting an attempt."""
+
+
+async def score_with_cache(digest: str, resume_text: str, jds: List[str]) -> Dict[str, float]:
+    similarities = {}
+    misses = {}
+    for jd in jds:
+        jd_hash = sha256_text(jd)
+        score = resume_cache.get_score(digest, jd_hash)
+        if score is None:
+            misses[jd_hash] = jd
+        else:
+            similarities[jd] = score
+    scores, from_model = await score_jds_with_source(resume_text, list(misses.values()))
+    new_scores = {}
+    for jd_hash, jd in misses.items():
+        similarities[jd] = scores.get(jd, 0)
+        # local fallback scores are not cached: the next upload retries the model
+        if jd in from_model:
+            new_scores[jd_hash] = similarities[jd]
+    await resume_cache.put_scores(digest, new_scores)
+    return similarities
+
+
+class AnalysisQueue:
+    """
+    In-process worker pool over the Mongo-backed `resume_jobs` queue.
+    New jobs are handed to local workers directly; idle workers also poll
+    Mongo, which picks up jobs left over from a restart or another process.
+    """
+
+    def __init__(self, workers: int, max_attempts: int, lease_seconds: float, poll_seconds: float):
+        self.workers = max(1, workers)
+        self.max_attempts = max(1, max_attempts)
+        self.lease = timedelta(seconds=lease_seconds)
+        self.poll_seconds = poll_seconds
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._stopping = False
+
+    def start(self):
+        if self._tasks:
+            return
+        self._stopping = False
+        self._queue = asyncio.Queue()
+        self._tasks = [asyncio.create_task(self._worker(i)) for i in range(self.workers)]
+
+    def _cancel_requested(self) -> bool:
+        """True when this worker task itself is being cancelled (stop(), or loop teardown on 3.11+)."""
+        task = asyncio.current_task()
+        cancelling = getattr(task, "cancelling", None)
+        return self._stopping or bool(cancelling and cancelling())
+
+    async def stop(self):
+        self._stopping = True
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    # ---------------- producer side ----------------
+    async def submit(self, user_id: str, filename: str, kind: str, path: str, digest: str,
+                     job_descriptions: Optional[List[str]]) -> Dict[str, Any]:
+        file_id = await store_original(path, filename, digest)
+        now = datetime.utcnow()
+        job = {
+            "user_id": user_id,
+            "filename": filename,
+            "kind": kind,
+            "file_id": file_id,
+            "content_hash": digest,
+            "job_descriptions": job_descriptions or [],
+            "status": QUEUED,
+            "attempts": 0,
+            "created_at": now,
+            "updated_at": now,
+        }
+        res = await db.resume_jobs.insert_one(job)
+        if self._queue is not None:
+            self._queue.put_nowait(res.inserted_id)
+        return job
+
+    async def wait_for_change(self, job_id: str, timeout: float):
+        """Block until this process updates the job, or `timeout` passes."""
+        event = self._changed.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            if self._changed.get(job_id) is event:
+                del self._changed[job_id]
+
+    def _notify(self, job_id: ObjectId):
+        event = self._changed.pop(str(job_id), None)
+        if event is not None:
+            event.set()
+
+    # ---------------- worker side ----------------
+    async def _claim(self, job_id: Optional[ObjectId] = None) -> Optional[dict]:
+        now = datetime.utcnow()
+        query: Dict[str, Any] = {"$or": [
+            {"status": QUEUED},
+            {"status": RUNNING, "lease_until": {"$lt": now}},
+        ]}
+        if job_id is not None:
+            query["_id"] = job_id
+        job = await db.resume_jobs.find_one_and_update(
+            query,
+            {"$set": {"status": RUNNING, "lease_until": now + self.lease, "updated_at": now}, "$inc": {"attempts": 1}},
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if job:
+            self._notify(job["_id"])
+        return job
+
+    async def _next_job(self) -> Optional[dict]:
+        try:
+            job_id = await asyncio.wait_for(self._queue.get(), self.poll_seconds)
+        except asyncio.TimeoutError:
+            return await self._claim()
+        return await self._claim(job_id)
+
+    async def _worker(self, n: int):
+        while True:
+            try:
+                job = await self._next_job()
+                if job:
+                    await self._run(job)
+            except asyncio.CancelledError:
+                if self._cancel_requested():
+                    raise
+                logger.warning("Resume analysis worker %d caught a stray cancellation; continuing", n)
+            except Exception:
+                logger.exception("Resume analysis worker %d crashed; continuing", n)
+                await asyncio.sleep(self.poll_seconds)
+
+    async def _finish(self, job: dict, update: Dict[str, Any], attempts_delta: int = 0):
+        update["updated_at"] = datetime.utcnow()
+        change: Dict[str, Any] = {"$set": update, "$unset": {"lease_until": ""}}
+        if attempts_delta:
+            change["$inc"] = {"attempts": attempts_delta}
+        await db.resume_jobs.update_one({"_id": job["_id"]}, change)
+        self._notify(job["_id"])
+
+    async def _run(self, job: dict):
+        # attempts was incremented by the claim, so crashed workers count too
+        attempts = job.get("attempts", 1)
+        if attempts > self.max_attempts:
+            await self._finish(job, {"status": FAILED, "error": job.get("error") or "Worker lost the job too many times"})
+            return
+        try:
+            resume_id = await self.process(job)
+        except RetryLater as e:
+            await self._finish(job, {"status": QUEUED, "error": str(e)}, attempts_delta=-1)
+            await asyncio.sleep(self.poll_seconds)
+        except asyncio.CancelledError:
+            if self._cancel_requested():
+                raise
+            # not stop(): something under the job (e.g. an executor future) was cancelled
+            logger.warning("Resume analysis %s was cancelled (attempt %d)", job["_id"], attempts)
+            status = FAILED if attempts >= self.max_attempts else QUEUED
+            await self._finish(job, {"status": status, "error": "Analysis was interrupted"})
+        except Exception as e:
+            logger.exception("Resume analysis %s failed (attempt %d)", job["_id"], attempts)
+            status = FAILED if attempts >= self.max_attempts else QUEUED
+            await self._finish(job, {"status": status, "error": str(e) or type(e).__name__})
+        else:
+            await self._finish(job, {"status": DONE, "resume_id": resume_id, "error": None})
+
+    async def process(self, job: dict) -> str:
+        """
+        Extract, find skills, score and store the resume. The resume reuses
+        the job's _id, so a retried job never stores a second copy.
+        """
+        digest = job["content_hash"]
+        cached = await resume_cache.get_extraction(digest)
+        if cached:
+            resume_text, pages = cached["text"], cached.get("pages")
+        else:
+            path = await fetch_original(job["file_id"], f".{job['kind']}")
+            try:
+                resume_text, pages = await extractor.extract(job["kind"], path)
+            except ExtractionBusy as e:
+                raise RetryLater(str(e) or "Extraction queue full")
+            finally:
+                os.unlink(path)
+        # cheap enough to redo on a cache hit, so taxonomy edits apply to re-uploads
+        skill_counts = skill_matcher.counts(resume_text)
+        skills = list(skill_counts)
+        if not cached:
+            await resume_cache.put_extraction(digest, resume_text, skills, pages)
+        # no-op when this content's text is already stored
+        await save_text(digest, resume_text)
+
+        similarities = {}
+        if job.get("job_descriptions"):
+            similarities = await score_with_cache(digest, resume_text, job["job_descriptions"])
+
+        doc = {
+            "_id": job["_id"],
+            "user_id": job["user_id"],
+            "filename": job["filename"],
+            "excerpt": excerpt_of(resume_text),
+            "pages": pages,
+            "skills": skills,
+            "skill_counts": skill_counts,
+            "vector": vectorize(resume_text),
+            "similarity_score": similarities,
+            "content_hash": digest,
+            "text_id": digest,
+            "file_id": job["file_id"],
+            "uploaded_at": datetime.utcnow(),
+        }
+        try:
+            await db.resumes.insert_one(doc)
+        except DuplicateKeyError:
+            return str(job["_id"])  # stored by an earlier attempt
+        await rollups.record(resumes=1)
+        await candidate_index.add(doc, resume_text)
+        job_candidates.resume_added(doc)
+        return str(job["_id"])
+
+
+analysis_queue = AnalysisQueue(
+    workers=settings.ANALYSIS_WORKERS,
+    max_attempts=settings.ANALYSIS_MAX_ATTEMPTS,
+    lease_seconds=settings.ANALYSIS_LEASE_SECONDS,
+    poll_seconds=settings.ANALYSIS_POLL_SECONDS,
+)
@@ -0,0 +1,124 @@
+# app/bulk.py
+import csv
+import json
+import re
+from typing import Any, AsyncIterator, Dict, List, Tuple, Union
+
+from pydantic import ValidationError
+
+# Streaming parsers for bulk imports. Each yields (row number, record or
+# exception) so one bad row never aborts the whole upload.
+Row = Tuple[int, Any]
+
+_SKILL_SPLIT_RE = re.compile(r"[;|]")
+
+
+MAX_RECORD_BYTES = 1 << 20
+
+
+def _too_long(max_bytes: int) -> ValueError:
+    return ValueError(f"Record exceeds {max_bytes} bytes")
+
+
+def _decode(line: bytes) -> str:
+    return line.rstrip(b"\r").decode("utf-8", errors="replace")
+
+
+async def iter_lines(stream: AsyncIterator[bytes], max_bytes: int = MAX_RECORD_BYTES) -> AsyncIterator[Union[str, ValueError]]:
+    """
+    Split a byte stream into lines; only one partial line, of at most
+    `max_bytes`, is buffered. A longer line is skipped and yields a ValueError.
+    """
+    buf = b""
+    skipping = False
+    async for chunk in stream:
+        buf += chunk
+        *lines, buf = buf.split(b"\n")
+        for line in lines:
+            if skipping:
+                skipping = False  # the end of an overlong line
+                continue
+            yield _decode(line) if len(line) <= max_bytes else _too_long(max_bytes)
+        if len(buf) > max_bytes:
+            if not skipping:
+                yield _too_long(max_bytes)
+                skipping = True
+            buf = b""
+    if buf.strip() and not skipping:
+        yield _decode(buf)
+
+
+async def iter_ndjson(stream: AsyncIterator[bytes], max_bytes: int = MAX_RECORD_BYTES) -> AsyncIterator[Row]:
+    n = 0
+    async for line in iter_lines(stream, max_bytes):
+        n += 1
+        if isinstance(line, ValueError):
+            yield n, line
+            continue
+        if not line.strip():
+            continue
+        try:
+            yield n, json.loads(line)
+        except ValueError as e:
+            yield n, ValueError(f"Invalid JSON: {e}")
+
+
+async def iter_csv(stream: AsyncIterator[bytes], max_bytes: int = MAX_RECORD_BYTES) -> AsyncIterator[Row]:
+    """
+    CSV with a header row. Quoted fields may span lines, up to `max_bytes`
+    per record; `skills` is split on ';' or '|'. Row numbers count records,
+    the header being row 0.
+    """
+    header = None
+    pending = ""
+    n = 0
+    async for line in iter_lines(stream, max_bytes):
+        if isinstance(line, ValueError):
+            # drop the partial record too; it cannot be completed
+            pending = ""
+            n += 1
+            yield n, line
+            continue
+        pending = f"{pending}\n{line}" if pending else line
+        if pending.count('"') % 2:
+            if len(pending) > max_bytes:
+                pending = ""
+                n += 1
+                yield n, ValueError(f"Record exceeds {max_bytes} bytes (unterminated quote?)")
+            continue  # inside a quoted field
+        record, pending = pending, ""
+        if not record.strip():
+            continue
+        try:
+            values = next(csv.reader([record]))
+        except csv.Error as e:
+            n += 1
+            yield n, ValueError(f"Invalid CSV: {e}")
+            continue
+        if header is None:
+            header = [h.strip() for h in values]
+            continue
+        n += 1
+        row: Dict[str, Any] = dict(zip(header, values))
+        if "skills" in row:
+            row["skills"] = [s.strip() for s in _SKILL_SPLIT_RE.split(row["skills"]) if s.strip()]
+        yield n, row
+    if pending:
+        yield n + 1, ValueError("Unterminated quoted field at end of input")
+
+
+def describe_error(err: Exception) -> str:
+    if isinstance(err, ValidationError):
+        return "; ".join(
+            f"{'.'.join(str(p) for p in e['loc']) or 'row'}: {e['msg']}" for e in err.errors()
+        )
+    return str(err)
+
+
+def row_error(row: int, err: Exception) -> Dict[str, Any]:
+    return {"row": row, "error": describe_error(err)}
+
+
+def collect_write_errors(details: Dict[str, Any], rows: List[int]) -> List[Dict[str, Any]]:
+    """Map BulkWriteError details of an unordered insert_many back to row numbers."""
+    return [{"row": rows[e["index"]], "error": e.get("errmsg", "write failed")} for e in details.get("writeErrors", [])]
@@ -0,0 +1,131 @@
+# app/cache.py
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Hashable, List, Optional
+
+from app.config import settings
+from app.db import db
+from app.storage import load_text
+
+_MISSING = object()
+
+
+def sha256_text(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TTLCache:
+    """
+    Small in-process LRU with a per-entry time-to-live.
+    Not thread safe; meant to be used from the event loop only.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING or item[0] < time.monotonic():
+            if item is not _MISSING:
+                del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def set(self, key: Hashable, value: Any):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class ResumeCache:
+    """
+    Content-addressed cache for resume analysis.
+    Extraction results are keyed by SHA-256 of the uploaded bytes and
+    similarity scores by (resume hash, JD text hash). Lookups go to the
+    in-process LRU first, then to the `resume_cache` collection.
+    """
+
+    def __init__(self, max_entries: int, ttl: float):
+        self._extractions = TTLCache(max_entries, ttl)
+        self._scores = TTLCache(max_entries * 16, ttl)
+        self.mongo_hits = 0
+        self.mongo_misses = 0
+
+    async def get_extraction(self, digest: str) -> Optional[Dict[str, Any]]:
+        hit = self._extractions.get(digest)
+        if hit is not None:
+            return hit
+        doc = await db.resume_cache.find_one({"_id": digest}, {"text": 1, "skills": 1, "pages": 1, "scores": 1})
+        # the text itself lives in `resume_texts`; older entries kept it inline
+        text = doc.get("text") if doc else None
+        if doc and text is None:
+            text = await load_text(digest)
+        if text is None:
+            self.mongo_misses += 1
+            return None
+        self.mongo_hits += 1
+        hit = {"text": text, "skills": doc.get("skills", []), "pages": doc.get("pages")}
+        self._extractions.set(digest, hit)
+        for jd_hash, score in (doc.get("scores") or {}).items():
+            self._scores.set((digest, jd_hash), score)
+        return hit
+
+    async def put_extraction(self, digest: str, text: str, skills: List[str], pages: Optional[int] = None):
+        """The caller stores the text itself with storage.save_text(digest, ...)."""
+        hit = {"text": text, "skills": skills, "pages": pages}
+        self._extractions.set(digest, hit)
+        await db.resume_cache.update_one(
+            {"_id": digest},
+            {"$set": {"skills": skills, "pages": pages}, "$unset": {"text": ""}, "$setOnInsert": {"created_at": datetime.utcnow()}},
+            upsert=True,
+        )
+
+    def get_score(self, digest: str, jd_hash: str) -> Optional[float]:
+        return self._scores.get((digest, jd_hash))
+
+    async def put_scores(self, digest: str, scores: Dict[str, float]):
+        if not scores:
+            return
+        for jd_hash, score in scores.items():
+            self._scores.set((digest, jd_hash), score)
+        await db.resume_cache.update_one(
+            {"_id": digest},
+            {"$set": {f"scores.{h}": s for h, s in scores.items()}, "$setOnInsert": {"created_at": datetime.utcnow()}},
+            upsert=True,
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "extraction_hits": self._extractions.hits,
+            "extraction_misses": self._extractions.misses,
+            "score_hits": self._scores.hits,
+            "score_misses": self._scores.misses,
+            "mongo_hits": self.mongo_hits,
+            "mongo_misses": self.mongo_misses,
+            "entries": len(self._extractions),
+        }
+
+
+resume_cache = ResumeCache(
+    max_entries=settings.RESUME_CACHE_MAX_ENTRIES,
+    ttl=settings.RESUME_CACHE_TTL_SECONDS,
+)
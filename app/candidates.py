@@ -0,0 +1,160 @@
+# app/candidates.py
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+from app.cache import TTLCache
+from app.config import settings
+from app.db import db, claim_task, finish_task
+from app.matching import tokenize
+from app.skills import skill_matcher
+from app.storage import text_of
+
+logger = logging.getLogger(__name__)
+
+# `candidate_index` holds one entry per candidate (their latest resume):
+#   {_id: resume id, user_id, skills: [...], terms: [...], uploaded_at}
+# Multikey indexes on `skills` and `terms` make each term lookup a posting list.
+MAX_TERMS = 3000
+BACKFILL_VERSION = 1
+
+_FILLER = frozenset(
+    "top best find show me list give all any candidates candidate people persons resumes resume "
+    "who with and or having has know knows skill skills skilled experience experienced in "
+    "mentioning developers developer engineers engineer located based".split()
+)
+_TOP_RE = re.compile(r"\btop\s+(\d+)\b")
+_LOCATION_RE = re.compile(r"\b(?:in|from)\s+([a-z][a-z .'-]*)$")
+
+
+def normalize_skill(skill: str) -> str:
+    return " ".join(skill.lower().split())
+
+
+def index_entry(resume: Dict[str, Any], text: str) -> Dict[str, Any]:
+    skills = sorted({normalize_skill(s) for s in resume.get("skills", []) if s.strip()})
+    terms = list(dict.fromkeys(tokenize(text)))[:MAX_TERMS]
+    return {
+        "_id": resume["_id"],
+        "user_id": resume["user_id"],
+        "skills": skills,
+        "terms": terms,
+        "uploaded_at": resume.get("uploaded_at", datetime.utcnow()),
+    }
+
+
+class CandidateIndex:
+    """
+    Inverted index of resume skills/terms stored in Mongo, with a hot
+    in-process cache of posting lists (term -> set of resume ids).
+    """
+
+    def __init__(self, max_terms: int, ttl: float):
+        self._postings = TTLCache(max_terms, ttl)
+        self._backfill_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._backfill_task is None:
+            self._backfill_task = asyncio.create_task(self._run_backfill())
+
+    async def ready(self):
+        self.start()
+        await asyncio.shield(self._backfill_task)
+
+    async def add(self, resume: Dict[str, Any], text: str):
+        entry = index_entry(resume, text)
+        # a candidate is searchable through their latest resume only
+        stale = await db.candidate_index.find(
+            {"user_id": entry["user_id"], "_id": {"$ne": entry["_id"]}}, {"terms": 1, "skills": 1}
+        ).to_list(None)
+        await db.candidate_index.replace_one({"_id": entry["_id"]}, entry, upsert=True)
+        if stale:
+            await db.candidate_index.delete_many({"_id": {"$in": [s["_id"] for s in stale]}})
+        for doc in stale + [entry]:
+            for term in doc.get("terms", []) + doc.get("skills", []):
+                self._postings.pop(term)
+
+    async def backfill(self):
+        """Index the latest resume of every candidate not indexed yet; safe to re-run."""
+        latest: Dict[str, Any] = {}
+        async for r in db.resumes.find({}, {"user_id": 1, "text_id": 1, "skills": 1, "uploaded_at": 1}).sort("uploaded_at", 1):
+            latest[r["user_id"]] = r
+        added = 0
+        for user_id, r in latest.items():
+            # indexed by an earlier (interrupted) run, or by a newer upload meanwhile
+            if await db.candidate_index.find_one({"user_id": user_id}, {"_id": 1}):
+                continue
+            await db.candidate_index.replace_one({"_id": r["_id"]}, index_entry(r, await text_of(r)), upsert=True)
+            added += 1
+        logger.info("Candidate index backfilled with %d resumes", added)
+
+    async def _run_backfill(self):
+        if not await claim_task("candidate_index", BACKFILL_VERSION, timedelta(hours=1)):
+            return
+        try:
+            await self.backfill()
+        except Exception as e:
+            await finish_task("candidate_index", e)
+            logger.exception("Candidate index backfill failed")
+            return
+        await finish_task("candidate_index")
+
+    async def postings(self, term: str) -> Set[Any]:
+        ids = self._postings.get(term)
+        if ids is None:
+            cur = db.candidate_index.find({"$or": [{"skills": term}, {"terms": term}]}, {"_id": 1})
+            ids = {d["_id"] async for d in cur}
+            self._postings.set(term, ids)
+        return ids
+
+    async def search(self, skills: List[str], location: List[str], limit: int) -> List[Dict[str, Any]]:
+        """Resumes containing every skill and location term, best skill matches first."""
+        lists = sorted([await self.postings(t) for t in skills + location], key=len)
+        if not lists:
+            return []
+        hits = set(lists[0])
+        for p in lists[1:]:
+            hits &= p
+            if not hits:
+                return []
+
+        docs = await db.candidate_index.find(
+            {"_id": {"$in": list(hits)}}, {"user_id": 1, "skills": 1, "uploaded_at": 1}
+        ).to_list(None)
+        wanted = set(skills)
+        # a term listed as a skill counts double vs. one only mentioned in the text
+        for d in docs:
+            skill_hits = len(wanted & set(d.get("skills", [])))
+            d["score"] = round(100.0 * (len(wanted) + skill_hits) / (2 * len(wanted)), 1) if wanted else 100.0
+        docs.sort(key=lambda d: (d["score"], d.get("uploaded_at") or datetime.min), reverse=True)
+        return docs[:limit]
+
+
+def parse_query(query: str) -> Dict[str, Any]:
+    """
+    "top 20 candidates with python and kubernetes in Berlin" ->
+    {"limit": 20, "skills": ["python", "kubernetes"], "location": ["berlin"]}
+    """
+    q = " ".join(query.lower().replace(",", " ").replace("?", " ").split())
+    m = _TOP_RE.search(q)
+    limit = min(int(m.group(1)), 100) if m else 10
+    q = _TOP_RE.sub(" ", q).strip()
+
+    location: List[str] = []
+    m = _LOCATION_RE.search(q)
+    if m:
+        location = tokenize(m.group(1))
+        q = q[:m.start()]
+    # whole taxonomy skills first ("machine learning", "k8s" -> "kubernetes"),
+    # so multi-word names are not split into separate terms
+    skills, rest = skill_matcher.split(q)
+    skills += [skill_matcher.canonical(t) for t in tokenize(rest) if t not in _FILLER and not t.isdigit()]
+    return {"limit": limit, "skills": list(dict.fromkeys(skills)), "location": location}
+
+
+candidate_index = CandidateIndex(
+    max_terms=settings.CANDIDATE_POSTINGS_CACHE_TERMS,
+    ttl=settings.CANDIDATE_POSTINGS_CACHE_SECONDS,
+)
@@ -1,3 +1,4 @@
+import os
 from pydantic_settings import BaseSettings
 from typing import List
 
@@ -10,6 +11,110 @@ class Settings(BaseSettings):
     ALLOW_ORIGINS: str = "http://localhost:5173,http://127.0.0.1:5173,https://resume-frontend-cyan.vercel.app"
     HUGGINGFACE_API_KEY: str = ""
 
+    # Server (app/uvicorn_app.py); 0 workers = one per CPU
+    HOST: str = "0.0.0.0"
+    WEB_CONCURRENCY: int = 0
+    KEEPALIVE_SECONDS: int = 75
+    BACKLOG: int = 2048
+    LIMIT_CONCURRENCY: int = 0
+    GRACEFUL_SHUTDOWN_SECONDS: int = 30
+
+    # Mongo connection budget, shared by all workers of one instance
+    MONGO_MAX_CONNECTIONS: int = 100
+    # Per-process pool; 0 = MONGO_MAX_CONNECTIONS / workers
+    MONGO_MAX_POOL_SIZE: int = 0
+    MONGO_MIN_POOL_SIZE: int = 2
+    MONGO_MAX_IDLE_TIME_MS: int = 60_000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5_000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5_000
+    MONGO_SOCKET_TIMEOUT_MS: int = 30_000
+    # snappy also works if python-snappy is installed
+    MONGO_COMPRESSORS: str = "zstd,zlib"
+    MONGO_LIST_READ_PREFERENCE: str = "secondaryPreferred"
+    MONGO_AWAIT_INDEXES: bool = False
+    MONGO_INDEX_BUILD_TIMEOUT_SECONDS: float = 300.0
+    READY_PING_TIMEOUT_SECONDS: float = 2.0
+
+    # Password hashing
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_THREADS: int = 4
+    PASSWORD_HASH_MAX_PENDING: int = 64
+
+    # Candidate search (admin chatbot)
+    CANDIDATE_POSTINGS_CACHE_TERMS: int = 5000
+    CANDIDATE_POSTINGS_CACHE_SECONDS: int = 60
+
+    # Top candidates per job (`job_candidates`), kept up to date in the background
+    JOB_CANDIDATES_TOP_K: int = 50
+    JOB_CANDIDATES_RESUME_BATCH: int = 1000
+    JOB_CANDIDATES_JOB_BATCH: int = 200
+    JOB_CANDIDATES_JOBS_PER_RESUME: int = 500
+
+    # Bulk job import
+    BULK_BATCH_SIZE: int = 500
+    BULK_MAX_ERRORS: int = 1000
+    # longest NDJSON line / CSV record (quoted fields included)
+    BULK_MAX_RECORD_BYTES: int = 1024 * 1024
+
+    # Cached public job listing, invalidated through `cache_versions`
+    JOBS_CACHE_MAX_ENTRIES: int = 1024
+    JOBS_CACHE_TTL_SECONDS: int = 300
+    JOBS_CACHE_POLL_SECONDS: float = 1.0
+
+    # List responses: orjson default response class, and list endpoints
+    # return their mapped rows without response_model revalidation
+    FAST_JSON: bool = False
+
+    # Admin dashboard rollups
+    DASHBOARD_CACHE_SECONDS: int = 15
+
+    # Authenticated user lookups
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    USER_CACHE_TTL_SECONDS: int = 30
+    AUTH_TRUST_CLAIMS: bool = True
+
+    # Logging & metrics
+    LOG_JSON: bool = True
+    LOG_SAMPLE_RATE: float = 0.01
+    LOG_SLOW_REQUEST_MS: int = 1000
+
+    # Hugging Face inference client
+    HF_API_BASE: str = "https://api-inference.huggingface.co"
+    HF_SIMILARITY_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+    HF_TIMEOUT_SECONDS: float = 20.0
+    HF_MAX_CONNECTIONS: int = 20
+    HF_MAX_CONCURRENCY: int = 8
+    HF_BATCH_SIZE: int = 16
+    HF_BREAKER_FAILURES: int = 5
+    HF_BREAKER_RESET_SECONDS: float = 30.0
+
+    # Resume text extraction (process pool)
+    EXTRACT_WORKERS: int = 2
+    EXTRACT_MAX_QUEUE: int = 16
+    EXTRACT_TIMEOUT_SECONDS: float = 30.0
+    EXTRACT_MAX_PAGES: int = 50
+    EXTRACT_MAX_TASKS_PER_WORKER: int = 100
+    EXTRACT_MAX_CHARS: int = 20000
+    RESUME_MAX_BYTES: int = 10 * 1024 * 1024
+    UPLOAD_CHUNK_SIZE: int = 64 * 1024
+
+    # Background resume analysis
+    ANALYSIS_WORKERS: int = 2
+    ANALYSIS_MAX_ATTEMPTS: int = 3
+    ANALYSIS_LEASE_SECONDS: float = 120.0
+    ANALYSIS_POLL_SECONDS: float = 2.0
+
+    # Content-hash cache for extraction and scoring
+    RESUME_CACHE_MAX_ENTRIES: int = 512
+    RESUME_CACHE_TTL_SECONDS: int = 3600
+    RESUME_CACHE_MONGO_TTL_SECONDS: int = 30 * 24 * 3600
+
+    # Skill taxonomy JSON; empty = the bundled app/data/skills.json
+    SKILLS_TAXONOMY_PATH: str = ""
+
+    # Stored originals and full texts
+    RESUME_ZSTD_LEVEL: int = 9
+
     model_config = {
         "env_file": ".env",
         "case_sensitive": True,
@@ -20,3 +125,10 @@ settings = Settings()
 ALLOWED_ORIGINS: List[str] = [
     o.strip() for o in settings.ALLOW_ORIGINS.split(",") if o.strip()
 ]
+
+def web_concurrency() -> int:
+    return settings.WEB_CONCURRENCY or os.cpu_count() or 1
+
+def mongo_pool_size() -> int:
+    """Per-process maxPoolSize, so N workers together stay within MONGO_MAX_CONNECTIONS."""
+    return max(5, settings.MONGO_MAX_CONNECTIONS // web_concurrency())
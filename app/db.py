@@ -1,17 +1,227 @@
 # app/db.py
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.config import settings
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
+from pymongo import ReadPreference
+from pymongo.errors import DuplicateKeyError
+from app.config import settings, mongo_pool_size
+from app.instrumentation import MongoCommandTimer, PoolMonitor
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
 import asyncio
+import logging
+import os
+import socket
 
-client = AsyncIOMotorClient(settings.MONGO_URI)
-db = client[settings.DB_NAME]
+logger = logging.getLogger(__name__)
+
+# The client is created by connect() in the app's startup, inside the
+# worker's own event loop; `db` and `read_db` resolve to it lazily.
+client: Optional[AsyncIOMotorClient] = None
+_database: Optional[AsyncIOMotorDatabase] = None
+pool_monitor = PoolMonitor()
+
+def _client_options() -> Dict[str, Any]:
+    opts: Dict[str, Any] = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE or mongo_pool_size(),
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "socketTimeoutMS": settings.MONGO_SOCKET_TIMEOUT_MS,
+        "event_listeners": [MongoCommandTimer(), pool_monitor],
+    }
+    if settings.MONGO_COMPRESSORS:
+        opts["compressors"] = settings.MONGO_COMPRESSORS
+    return opts
+
+def connect(existing: Optional[AsyncIOMotorClient] = None) -> AsyncIOMotorDatabase:
+    """Create the process's client (or adopt `existing`); later calls are no-ops."""
+    global client, _database
+    if client is None:
+        client = existing or AsyncIOMotorClient(settings.MONGO_URI, **_client_options())
+        _database = client[settings.DB_NAME]
+    return _database
+
+def database() -> AsyncIOMotorDatabase:
+    if _database is None:
+        raise RuntimeError("Database used before connect(); it is created on app startup")
+    return _database
+
+class _LazyDatabase:
+    """Forwards `db.<collection>` to the database once connect() has run."""
+
+    def __init__(self, collection: Callable[[str], Any]):
+        self._collection = collection
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self._collection(name)
+
+    def __getitem__(self, name: str):
+        return self._collection(name)
+
+    async def command(self, *args, **kwargs):
+        return await database().command(*args, **kwargs)
+
+db = _LazyDatabase(lambda name: database()[name])
+
+# Read-only list endpoints may be served by a secondary (slightly stale).
+_READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+read_db = _LazyDatabase(
+    lambda name: database().get_collection(name, read_preference=_READ_PREFERENCES[settings.MONGO_LIST_READ_PREFERENCE])
+)
+
+async def ensure_unique_applications_index():
+    """
+    (user_id, job_id) used to be a non-unique index; upgrade it in place.
+    If old duplicates block the unique build, the non-unique index is restored.
+    """
+    keys = [("user_id", 1), ("job_id", 1)]
+    info = await db.applications.index_information()
+    current = info.get("user_id_1_job_id_1")
+    if current and current.get("unique"):
+        return
+    if current:
+        await db.applications.drop_index("user_id_1_job_id_1")
+    try:
+        await db.applications.create_index(keys, unique=True)
+    except Exception:
+        logger.exception("Duplicate applications prevent a unique (user_id, job_id) index")
+        await db.applications.create_index(keys, unique=False)
+
+# Bump when the index list below changes so one worker rebuilds them.
+INDEX_VERSION = 3
+INDEX_BUILD_LEASE = timedelta(minutes=10)
+
+_index_task: Optional[asyncio.Task] = None
+
+async def create_indexes():
+    await db.users.create_index("email", unique=True)
+    await db.jobs.create_index([("created_at", -1)])  # Ensure created_at is indexed
+    # keyset pagination + filters on the job board
+    await db.jobs.create_index([("created_at", -1), ("_id", -1)])
+    await db.jobs.create_index([("company", 1), ("created_at", -1), ("_id", -1)])
+    await db.jobs.create_index([("location", 1), ("created_at", -1), ("_id", -1)])
+    await db.jobs.create_index([("skills", 1), ("created_at", -1), ("_id", -1)])
+    await db.applications.create_index([("user_id", 1), ("created_at", -1), ("_id", -1)])
+    await db.resume_cache.create_index("created_at", expireAfterSeconds=settings.RESUME_CACHE_MONGO_TTL_SECONDS)
+    await db.resume_jobs.create_index([("status", 1), ("created_at", 1)])
+    await db.candidate_index.create_index("terms")
+    await db.candidate_index.create_index("skills")
+    await db.candidate_index.create_index("user_id")
+    # a new resume pulls its user out of every job ranking
+    await db.job_candidates.create_index("top.user_id")
+    # one compressed original per content hash (older uncompressed files may repeat)
+    await db["resume_files.files"].create_index(
+        "metadata.sha256", unique=True, partialFilterExpression={"metadata.encoding": "zstd"}
+    )
+    await ensure_unique_applications_index()
+
+async def claim_task(key: str, version: int, lease: timedelta) -> bool:
+    """
+    Take the `app_meta` lease for a one-off maintenance task (index build,
+    migration). Only one worker wins; the others see a finished current
+    version, or a live lease, and skip it.
+    """
+    now = datetime.utcnow()
+    try:
+        await db.app_meta.find_one_and_update(
+            {"_id": key, "$or": [
+                {"version": {"$lt": version}},
+                {"state": "failed"},
+                {"state": "building", "lease_until": {"$lt": now}},
+            ]},
+            {"$set": {
+                "version": version,
+                "state": "building",
+                "owner": f"{socket.gethostname()}:{os.getpid()}",
+                "lease_until": now + lease,
+            }},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        return False
+    return True
+
+async def finish_task(key: str, error: Optional[BaseException] = None):
+    if error is not None:
+        await db.app_meta.update_one({"_id": key}, {"$set": {"state": "failed", "error": str(error)}})
+    else:
+        await db.app_meta.update_one(
+            {"_id": key}, {"$set": {"state": "ready", "built_at": datetime.utcnow()}, "$unset": {"lease_until": "", "error": ""}}
+        )
+
+async def build_indexes():
+    if not await claim_task("indexes", INDEX_VERSION, INDEX_BUILD_LEASE):
+        return
+    try:
+        await create_indexes()
+    except Exception as e:
+        await finish_task("indexes", e)
+        raise
+    await finish_task("indexes")
+    logger.info("Indexes (version %d) built", INDEX_VERSION)
+
+def _index_build_done(task: asyncio.Task):
+    if not task.cancelled() and task.exception():
+        logger.error("Index build failed", exc_info=task.exception())
 
 async def init_db():
-    async def create_indexes():
-        await db.users.create_index("email", unique=True)
-        await db.jobs.create_index([("created_at", -1)])  # Ensure created_at is indexed
-        await db.applications.create_index([("user_id", 1), ("job_id", 1)], unique=False)
-    asyncio.create_task(create_indexes())
+    global _index_task
+    connect()
+    # startup can run more than once per process (tests, reloads)
+    if _index_task is None:
+        _index_task = asyncio.create_task(build_indexes())
+        _index_task.add_done_callback(_index_build_done)
+    if settings.MONGO_AWAIT_INDEXES:
+        await wait_for_indexes(settings.MONGO_INDEX_BUILD_TIMEOUT_SECONDS)
+
+async def index_status() -> Dict[str, Any]:
+    """Build state shared by all workers, from the `app_meta` lease document."""
+    doc = await db.app_meta.find_one({"_id": "indexes"}) or {}
+    ready = doc.get("state") == "ready" and doc.get("version", 0) >= INDEX_VERSION
+    status: Dict[str, Any] = {
+        "ready": ready,
+        "state": doc.get("state", "missing"),
+        "version": doc.get("version"),
+        "expected_version": INDEX_VERSION,
+        "building_here": _index_task is not None and not _index_task.done(),
+    }
+    if doc.get("error"):
+        status["error"] = doc["error"]
+    return status
+
+async def wait_for_indexes(timeout: float):
+    """Block until this process's index build (if it runs one) has finished."""
+    if _index_task is not None:
+        await asyncio.wait_for(asyncio.shield(_index_task), timeout)
+
+async def ping(timeout: float) -> bool:
+    try:
+        await asyncio.wait_for(db.command("ping"), timeout)
+    except Exception:
+        return False
+    return True
+
+def pool_status() -> Dict[str, Any]:
+    return {
+        "connected": client is not None,
+        "max_pool_size": settings.MONGO_MAX_POOL_SIZE or mongo_pool_size(),
+        "min_pool_size": settings.MONGO_MIN_POOL_SIZE,
+        **pool_monitor.snapshot(),
+    }
 
 async def close_db():
-    client.close()
+    global client, _database, _index_task
+    if _index_task is not None and not _index_task.done():
+        _index_task.cancel()
+    _index_task = None
+    if client is not None:
+        client.close()
+    client, _database = None, None
@@ -0,0 +1,238 @@
+# app/extraction.py
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+
+import aiofiles
+from fastapi import UploadFile
+
+from app.config import settings
+from app.instrumentation import EXTRACT_PAGE_SECONDS
+from app.utils import collect_text, iter_pdf_pages, iter_docx_paragraphs
+
+
+class ExtractionBusy(Exception):
+    """Raised when the extraction queue is already full."""
+
+
+class ExtractionInterrupted(ExtractionBusy):
+    """Raised for a job whose worker was killed along with a timed-out one; safe to retry."""
+
+
+class ExtractionTimeout(Exception):
+    """Raised when an extraction job does not finish within its deadline."""
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds RESUME_MAX_BYTES."""
+
+
+# ---------------- Upload spooling ----------------
+async def spool_upload(file: UploadFile, max_bytes: int, chunk_size: int) -> Tuple[str, str]:
+    """
+    Copy an upload to a temp file in chunks, failing as soon as it grows past
+    `max_bytes`. Returns the temp file path and the SHA-256 of its content;
+    the caller removes the file.
+    """
+    suffix = os.path.splitext(file.filename or "")[1]
+    fd, path = tempfile.mkstemp(prefix="resume-", suffix=suffix)
+    os.close(fd)
+    size = 0
+    digest = hashlib.sha256()
+    try:
+        async with aiofiles.open(path, "wb") as out:
+            while True:
+                chunk = await file.read(chunk_size)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge()
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path, digest.hexdigest()
+
+
+# ---------------- Worker side (runs in the child process) ----------------
+def _timed(chunks: Iterable[str], durations: List[float]) -> Iterator[str]:
+    """Record how long producing each chunk (page) took."""
+    it = iter(chunks)
+    while True:
+        start = time.perf_counter()
+        try:
+            chunk = next(it)
+        except StopIteration:
+            return
+        durations.append(time.perf_counter() - start)
+        yield chunk
+
+
+def _run_extraction(kind: str, path: str, max_pages: int, max_chars: int, submitted_at: float):
+    started_at = time.time()
+    pages: List[float] = []
+    if kind == "pdf":
+        text = collect_text(_timed(iter_pdf_pages(path, max_pages), pages), max_chars)
+    else:
+        # DOCX has no real pages; the whole document counts as one
+        text = collect_text(iter_docx_paragraphs(path), max_chars)
+        pages.append(time.time() - started_at)
+    page_count = len(pages) if kind == "pdf" else None
+    return text, page_count, started_at - submitted_at, time.time() - started_at, pages
+
+
+# ---------------- Executor (runs in the event loop) ----------------
+class ExtractionExecutor:
+    """
+    Bounded process pool for PDF/DOCX text extraction.
+    Keeps pdfplumber off the event loop, rejects work when the queue is full
+    and recycles the pool after `max_tasks_per_worker` jobs per worker.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        timeout: float,
+        max_pages: int,
+        max_chars: int,
+        max_tasks_per_worker: int,
+    ):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.max_tasks_per_worker = max(1, max_tasks_per_worker)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # pools torn down by _kill; their queued futures were cancelled, not the callers
+        self._killed: "weakref.WeakSet[ProcessPoolExecutor]" = weakref.WeakSet()
+        self._pool_jobs = 0
+        self._inflight = 0
+        self._stats = {
+            "jobs": 0,
+            "rejected": 0,
+            "timeouts": 0,
+            "failures": 0,
+            "recycles": 0,
+            "queue_wait_total": 0.0,
+            "queue_wait_max": 0.0,
+            "extract_total": 0.0,
+            "extract_max": 0.0,
+        }
+
+    def start(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            self._pool_jobs = 0
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _recycle(self):
+        # Running and queued jobs finish in the old pool; its processes exit afterwards.
+        self._pool.shutdown(wait=False)
+        self._pool = None
+        self._stats["recycles"] += 1
+        self.start()
+
+    def _kill(self, pool: ProcessPoolExecutor):
+        """
+        Terminate a pool's worker processes. shutdown() alone leaves a hung
+        job running (and burning CPU) in its child forever.
+        """
+        for proc in list((pool._processes or {}).values()):
+            proc.terminate()
+        self._killed.add(pool)
+        pool.shutdown(wait=False, cancel_futures=True)
+        if pool is self._pool:
+            self._pool = None
+            self._stats["recycles"] += 1
+            self.start()
+
+    async def extract(self, kind: str, path: str) -> Tuple[str, Optional[int]]:
+        """Text and page count (None for DOCX, which has no fixed pages)."""
+        if self._inflight >= self.workers + self.max_queue:
+            self._stats["rejected"] += 1
+            raise ExtractionBusy()
+
+        self.start()
+        if self._pool_jobs >= self.workers * self.max_tasks_per_worker:
+            self._recycle()
+        self._pool_jobs += 1
+
+        self._inflight += 1
+        loop = asyncio.get_running_loop()
+        # the pool this job runs in; a routine recycle may replace self._pool meanwhile
+        pool = self._pool
+        try:
+            fut = loop.run_in_executor(
+                pool, _run_extraction, kind, path, self.max_pages, self.max_chars, time.time()
+            )
+            text, page_count, waited, took, pages = await asyncio.wait_for(fut, self.timeout)
+        except asyncio.TimeoutError:
+            self._stats["timeouts"] += 1
+            self._kill(pool)
+            raise ExtractionTimeout()
+        except BrokenProcessPool:
+            # killed because another job in the same pool timed out
+            self._stats["failures"] += 1
+            raise ExtractionInterrupted("Extraction worker restarted")
+        except asyncio.CancelledError:
+            if pool not in self._killed:
+                raise
+            # still queued when another job's timeout killed the pool
+            self._stats["failures"] += 1
+            raise ExtractionInterrupted("Extraction worker restarted")
+        except Exception:
+            self._stats["failures"] += 1
+            raise
+        finally:
+            self._inflight -= 1
+
+        s = self._stats
+        s["jobs"] += 1
+        s["queue_wait_total"] += waited
+        s["queue_wait_max"] = max(s["queue_wait_max"], waited)
+        s["extract_total"] += took
+        s["extract_max"] = max(s["extract_max"], took)
+        for page_seconds in pages:
+            EXTRACT_PAGE_SECONDS.observe(page_seconds, kind)
+        return text, page_count
+
+    def stats(self) -> Dict[str, Any]:
+        s = self._stats
+        jobs = max(1, s["jobs"])
+        return {
+            "workers": self.workers,
+            "inflight": self._inflight,
+            "jobs": s["jobs"],
+            "rejected": s["rejected"],
+            "timeouts": s["timeouts"],
+            "failures": s["failures"],
+            "recycles": s["recycles"],
+            "queue_wait_avg_ms": round(1000 * s["queue_wait_total"] / jobs, 2),
+            "queue_wait_max_ms": round(1000 * s["queue_wait_max"], 2),
+            "extract_avg_ms": round(1000 * s["extract_total"] / jobs, 2),
+            "extract_max_ms": round(1000 * s["extract_max"], 2),
+        }
+
+
+extractor = ExtractionExecutor(
+    workers=settings.EXTRACT_WORKERS,
+    max_queue=settings.EXTRACT_MAX_QUEUE,
+    timeout=settings.EXTRACT_TIMEOUT_SECONDS,
+    max_pages=settings.EXTRACT_MAX_PAGES,
+    max_chars=settings.EXTRACT_MAX_CHARS,
+    max_tasks_per_worker=settings.EXTRACT_MAX_TASKS_PER_WORKER,
+)
@@ -0,0 +1,146 @@
+# app/inference.py
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.config import settings
+from app.instrumentation import HF_SECONDS
+
+
+class CircuitOpen(Exception):
+    """Raised when the upstream has failed too often and calls are short-circuited."""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures, then lets a single
+    trial call through once `reset_timeout` seconds have passed.
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_inflight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial_inflight:
+            self._trial_inflight = True
+            return True
+        return False
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._trial_inflight = False
+
+    def release_trial(self):
+        self._trial_inflight = False
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_inflight = False
+        if self.opened_at is not None or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+
+
+class InferenceClient:
+    """
+    Application-lifetime client for the Hugging Face inference API.
+    One pooled HTTP/2 connection set, a semaphore bounding concurrent calls,
+    a per-call deadline and a circuit breaker in front of the upstream.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        timeout: float,
+        max_connections: int,
+        max_concurrency: int,
+        breaker: CircuitBreaker,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.breaker = breaker
+        self._sem = asyncio.Semaphore(max(1, max_concurrency))
+        self._client: Optional[httpx.AsyncClient] = None
+
+    async def start(self):
+        if self._client is not None:
+            return
+        headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=headers,
+            http2=True,
+            timeout=httpx.Timeout(self.timeout),
+            limits=httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_connections,
+            ),
+        )
+
+    async def close(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def post(self, model: str, payload: Dict[str, Any], deadline: Optional[float] = None) -> Any:
+        # fail fast without queueing on the semaphore while the circuit is open
+        if self.breaker.state == "open":
+            raise CircuitOpen(model)
+        await self.start()
+        async with self._sem:
+            # claim the half-open trial only once a slot is held, so a caller
+            # cancelled while queued cannot leave the trial marked in flight
+            if not self.breaker.allow():
+                raise CircuitOpen(model)
+            start = time.perf_counter()
+            try:
+                resp = await asyncio.wait_for(
+                    self._client.post(f"/models/{model}", json=payload),
+                    deadline or self.timeout,
+                )
+                resp.raise_for_status()
+                data = resp.json()
+            except asyncio.CancelledError:
+                self.breaker.release_trial()
+                raise
+            except asyncio.TimeoutError:
+                HF_SECONDS.observe(time.perf_counter() - start, model, "timeout")
+                self.breaker.record_failure()
+                raise
+            except Exception:
+                HF_SECONDS.observe(time.perf_counter() - start, model, "error")
+                self.breaker.record_failure()
+                raise
+        HF_SECONDS.observe(time.perf_counter() - start, model, "ok")
+        self.breaker.record_success()
+        return data
+
+
+inference = InferenceClient(
+    base_url=settings.HF_API_BASE,
+    api_key=settings.HUGGINGFACE_API_KEY,
+    timeout=settings.HF_TIMEOUT_SECONDS,
+    max_connections=settings.HF_MAX_CONNECTIONS,
+    max_concurrency=settings.HF_MAX_CONCURRENCY,
+    breaker=CircuitBreaker(settings.HF_BREAKER_FAILURES, settings.HF_BREAKER_RESET_SECONDS),
+)
@@ -0,0 +1,248 @@
+# app/job_candidates.py
+import asyncio
+import heapq
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from bson import ObjectId
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from scipy import sparse
+
+from app.candidates import candidate_index
+from app.config import settings
+from app.db import db, claim_task, finish_task
+from app.job_index import job_index
+from app.matching import doc_vector, job_text, to_matrix
+
+logger = logging.getLogger(__name__)
+
+# `job_candidates` holds the best-matching candidates of each job:
+#   {_id: job id, top: [{user_id, resume_id, score, uploaded_at}, ...],
+#    scanned_at, updated_at}
+# `top` stays sorted by score and capped at JOB_CANDIDATES_TOP_K. Candidates
+# are ranked through their latest resume (the one in `candidate_index`), by
+# the local vector score (0-100). A new job scans every candidate once
+# (`scanned_at`); a new resume replaces the user's previous entry in every
+# ranking that held it and pushes itself into the jobs it matches best.
+BACKFILL_VERSION = 1
+
+JobVector = Tuple[str, Dict[str, list]]
+
+
+def _push(job_id: str, entries: List[Dict[str, Any]], top_k: int, now: datetime, **fields: Any) -> UpdateOne:
+    return UpdateOne(
+        {"_id": job_id},
+        {
+            "$push": {"top": {"$each": entries, "$sort": {"score": -1}, "$slice": top_k}},
+            "$set": {"updated_at": now, **fields},
+        },
+        upsert=True,
+    )
+
+
+async def _bulk_write(ops: List[UpdateOne], ordered: bool):
+    try:
+        await db.job_candidates.bulk_write(ops, ordered=ordered)
+    except BulkWriteError as e:
+        errors = e.details.get("writeErrors", [])
+        # two upserts of the same new ranking raced; retry the losers now it exists
+        if not errors or any(w.get("code") != 11000 for w in errors):
+            raise
+        failed = [w["index"] for w in errors]
+        retry = ops[failed[0]:] if ordered else [ops[i] for i in failed]
+        await db.job_candidates.bulk_write(retry, ordered=ordered)
+
+
+class JobCandidates:
+    """Top-k candidate rankings per job, maintained as jobs and resumes arrive."""
+
+    def __init__(self, top_k: int, resume_batch: int, job_batch: int, jobs_per_resume: int):
+        self.top_k = top_k
+        self.resume_batch = resume_batch
+        self.job_batch = job_batch
+        self.jobs_per_resume = jobs_per_resume
+        self._tasks: Set[asyncio.Task] = set()
+        self._backfill_task: Optional[asyncio.Task] = None
+        # new jobs waiting for the (single) scan task of this process
+        self._pending_jobs: List[JobVector] = []
+        self._scan_task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self._backfill_task is None:
+            self._backfill_task = asyncio.create_task(self._run_backfill())
+
+    async def stop(self):
+        tasks = list(self._tasks)
+        if self._backfill_task is not None:
+            tasks.append(self._backfill_task)
+            self._backfill_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _spawn(self, coro, what: str) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+
+        def done(t: asyncio.Task):
+            self._tasks.discard(t)
+            if not t.cancelled() and t.exception() is not None:
+                logger.error("Ranking candidates for %s failed", what, exc_info=t.exception())
+
+        task.add_done_callback(done)
+        return task
+
+    def jobs_added(self, jobs: List[JobVector]):
+        """
+        Rank every candidate for new jobs, in the background. Jobs queue up
+        behind one scan task, so a large import scans `candidate_index` once
+        per JOB_CANDIDATES_JOB_BATCH jobs rather than once per insert batch.
+        """
+        self._pending_jobs.extend(jobs)
+        if self._pending_jobs and (self._scan_task is None or self._scan_task.done()):
+            self._scan_task = self._spawn(self._scan_pending(), "new jobs")
+
+    async def _scan_pending(self):
+        while self._pending_jobs:
+            batch = self._pending_jobs[:self.job_batch]
+            del self._pending_jobs[:self.job_batch]
+            await self.score_jobs(batch)
+
+    def resume_added(self, resume: Dict[str, Any]):
+        """Enter a new resume into the rankings of its best jobs, in the background."""
+        self._spawn(self.score_resume(resume), f"resume {resume['_id']}")
+
+    # ---------------- Jobs against all candidates ----------------
+    async def score_jobs(self, jobs: List[JobVector]):
+        """
+        One pass over all candidates for a batch of jobs: each page of
+        JOB_CANDIDATES_RESUME_BATCH resumes is scored against every job in
+        a single sparse multiply, keeping a top-k heap per job.
+        """
+        await candidate_index.ready()
+        matrix = to_matrix(vec for _, vec in jobs)
+        heaps: List[list] = [[] for _ in jobs]
+        page: List[Dict[str, Any]] = []
+        async for c in db.candidate_index.find({}, {"user_id": 1, "uploaded_at": 1}).batch_size(self.resume_batch):
+            page.append(c)
+            if len(page) >= self.resume_batch:
+                await self._rank_page(matrix, heaps, page)
+                page = []
+        if page:
+            await self._rank_page(matrix, heaps, page)
+
+        now = datetime.utcnow()
+        ops = []
+        for (job_id, _), heap in zip(jobs, heaps):
+            entries = [entry for _, _, entry in sorted(heap, reverse=True)]
+            # drop what a concurrent upload already pushed for the same resumes
+            ops.append(UpdateOne({"_id": job_id}, {"$pull": {"top": {"resume_id": {"$in": [e["resume_id"] for e in entries]}}}}))
+            ops.append(_push(job_id, entries, self.top_k, now, scanned_at=now))
+        await _bulk_write(ops, ordered=True)
+
+    async def _rank_page(self, jobs: sparse.csr_matrix, heaps: List[list], page: List[Dict[str, Any]]):
+        docs = await db.resumes.find({"_id": {"$in": [c["_id"] for c in page]}}, {"vector": 1}).to_list(None)
+        vectors = {d["_id"]: d["vector"] for d in docs if d.get("vector")}
+        rows = [c for c in page if c["_id"] in vectors]
+        if not rows:
+            return
+        scores = (jobs @ to_matrix(vectors[c["_id"]] for c in rows).T).toarray() * 100.0
+        k = min(self.top_k, len(rows))
+        for heap, row in zip(heaps, scores):
+            for i in np.argpartition(-row, k - 1)[:k]:
+                score = round(float(row[i]), 2)
+                if score <= 0:
+                    continue
+                c = rows[i]
+                item = (score, str(c["_id"]), {
+                    "user_id": c["user_id"],
+                    "resume_id": str(c["_id"]),
+                    "score": score,
+                    "uploaded_at": c.get("uploaded_at"),
+                })
+                if len(heap) < self.top_k:
+                    heapq.heappush(heap, item)
+                elif item[:2] > heap[0][:2]:
+                    heapq.heapreplace(heap, item)
+
+    # ---------------- A new resume against all jobs ----------------
+    async def score_resume(self, resume: Dict[str, Any]):
+        """
+        Replace the candidate's previous resume with this one in every ranking
+        that held it, and enter it into its best JOB_CANDIDATES_JOBS_PER_RESUME jobs.
+        """
+        await job_index.ready()
+        user_id = resume["user_id"]
+        vec = resume["vector"]
+        scores = {job_id: score for job_id, score in job_index.top_k(vec, self.jobs_per_resume) if score > 0}
+        held = [d["_id"] async for d in db.job_candidates.find({"top.user_id": user_id}, {"_id": 1})]
+        # rankings already holding the candidate are never rescanned; rescore them here
+        scores.update(job_index.scores_for(vec, [job_id for job_id in held if job_id not in scores]))
+        now = datetime.utcnow()
+        entry = {"user_id": user_id, "resume_id": str(resume["_id"]), "uploaded_at": resume.get("uploaded_at")}
+        ops = []
+        # pulled only where the new resume goes back in; a held job this worker's
+        # index has not seen yet keeps the old entry rather than losing the candidate
+        for job_id, score in scores.items():
+            ops.append(UpdateOne({"_id": job_id}, {"$pull": {"top": {"user_id": user_id}}}))
+            ops.append(_push(job_id, [{**entry, "score": score}], self.top_k, now))
+        if ops:
+            await _bulk_write(ops, ordered=True)
+
+    # ---------------- Reading ----------------
+    async def top(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """The stored ranking of a job, one entry per candidate; None if it has none yet."""
+        doc = await db.job_candidates.find_one({"_id": job_id})
+        if not doc:
+            return None
+        seen: Set[str] = set()
+        top = []
+        # a push racing a scan can briefly leave a candidate in twice
+        for entry in doc.get("top", []):
+            if entry["user_id"] not in seen:
+                seen.add(entry["user_id"])
+                top.append(entry)
+        return {"top": top, "scanned_at": doc.get("scanned_at"), "updated_at": doc.get("updated_at")}
+
+    # ---------------- Backfill ----------------
+    async def backfill(self):
+        """Scan candidates for every job that has never been scanned, JOB_CANDIDATES_JOB_BATCH jobs per pass."""
+        projection = {"vector": 1, "title": 1, "description": 1, "skills": 1}
+        last: Optional[ObjectId] = None
+        scanned = 0
+        while True:
+            query = {"_id": {"$gt": last}} if last is not None else {}
+            chunk = await db.jobs.find(query, projection).sort("_id", 1).limit(self.job_batch).to_list(self.job_batch)
+            if not chunk:
+                break
+            last = chunk[-1]["_id"]
+            ids = [str(j["_id"]) for j in chunk]
+            done = {d["_id"] async for d in db.job_candidates.find({"_id": {"$in": ids}, "scanned_at": {"$exists": True}}, {"_id": 1})}
+            todo = [(str(j["_id"]), doc_vector(j, job_text(j))) for j in chunk if str(j["_id"]) not in done]
+            if todo:
+                await self.score_jobs(todo)
+                scanned += len(todo)
+        if scanned:
+            logger.info("Ranked candidates for %d existing jobs", scanned)
+
+    async def _run_backfill(self):
+        if not await claim_task("job_candidates", BACKFILL_VERSION, timedelta(hours=2)):
+            return
+        try:
+            await self.backfill()
+        except Exception as e:
+            await finish_task("job_candidates", e)
+            logger.exception("Ranking candidates for existing jobs failed")
+            return
+        await finish_task("job_candidates")
+
+
+job_candidates = JobCandidates(
+    top_k=settings.JOB_CANDIDATES_TOP_K,
+    resume_batch=settings.JOB_CANDIDATES_RESUME_BATCH,
+    job_batch=settings.JOB_CANDIDATES_JOB_BATCH,
+    jobs_per_resume=settings.JOB_CANDIDATES_JOBS_PER_RESUME,
+)
@@ -0,0 +1,140 @@
+# app/job_index.py
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+from bson import ObjectId
+from scipy import sparse
+
+from app.db import db
+from app.matching import DIM, doc_vector, job_text, score_matrix, to_matrix
+
+logger = logging.getLogger(__name__)
+
+# refresh() rescans this far behind the newest job it has seen, to catch
+# jobs from other workers whose clocks (or inserts) were slightly behind
+REFRESH_OVERLAP = timedelta(minutes=5)
+
+
+class JobIndex:
+    """
+    In-memory matrix of job vectors (one CSR row per job).
+    Loaded once at startup; `add` appends new jobs, which are folded into
+    the matrix lazily on the next query. `refresh` picks up jobs that other
+    worker processes created.
+    """
+
+    def __init__(self):
+        self._ids: List[str] = []
+        self._matrix = sparse.csr_matrix((0, DIM), dtype=np.float32)
+        self._pending_ids: List[str] = []
+        self._pending_vecs: List[Dict[str, list]] = []
+        self._known: Set[str] = set()
+        self._newest: Optional[datetime] = None
+        self._load_task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._pending_ids)
+
+    def start(self):
+        if self._load_task is None:
+            self._load_task = asyncio.create_task(self.load())
+
+    async def ready(self):
+        self.start()
+        await asyncio.shield(self._load_task)
+
+    async def load(self):
+        ids, vecs, backfill = [], [], []
+        projection = {"vector": 1, "title": 1, "description": 1, "skills": 1, "created_at": 1}
+        async for j in db.jobs.find({}, projection):
+            vec = doc_vector(j, job_text(j))
+            if "vector" not in j:
+                backfill.append((j["_id"], vec))
+            ids.append(str(j["_id"]))
+            vecs.append(vec)
+            self._see(j.get("created_at"))
+        self._ids = ids
+        self._matrix = to_matrix(vecs)
+        # drop jobs added while loading that the scan already picked up
+        seen = set(ids)
+        pending = [(i, v) for i, v in zip(self._pending_ids, self._pending_vecs) if i not in seen]
+        self._pending_ids = [i for i, _ in pending]
+        self._pending_vecs = [v for _, v in pending]
+        self._known = seen | set(self._pending_ids)
+        # jobs created before vectors existed get theirs stored once
+        for oid, vec in backfill:
+            await db.jobs.update_one({"_id": oid}, {"$set": {"vector": vec}})
+        logger.info("Job index loaded: %d jobs (%d backfilled)", len(ids), len(backfill))
+
+    def _see(self, created_at: Optional[datetime]):
+        if created_at is not None and (self._newest is None or created_at > self._newest):
+            self._newest = created_at
+
+    def add(self, job_id: str, vec: Dict[str, list], created_at: Optional[datetime] = None):
+        if job_id in self._known:
+            return
+        self._known.add(job_id)
+        self._pending_ids.append(job_id)
+        self._pending_vecs.append(vec)
+        self._see(created_at)
+
+    async def refresh(self):
+        """Add jobs created since the newest one this process has seen."""
+        if self._load_task is None or not self._load_task.done():
+            return  # the initial load will see them
+        query = {}
+        if self._newest is not None:
+            query["created_at"] = {"$gte": self._newest - REFRESH_OVERLAP}
+        projection = {"vector": 1, "title": 1, "description": 1, "skills": 1, "created_at": 1}
+        added = 0
+        async for j in db.jobs.find(query, projection):
+            if str(j["_id"]) not in self._known:
+                self.add(str(j["_id"]), doc_vector(j, job_text(j)), j.get("created_at"))
+                added += 1
+        if added:
+            logger.info("Job index picked up %d jobs from other workers", added)
+
+    def _compact(self):
+        if not self._pending_ids:
+            return
+        self._matrix = sparse.vstack([self._matrix, to_matrix(self._pending_vecs)], format="csr")
+        self._ids.extend(self._pending_ids)
+        self._pending_ids, self._pending_vecs = [], []
+
+    def top_k(self, vec: Dict[str, list], k: int) -> List[Tuple[str, float]]:
+        self._compact()
+        scores = score_matrix(self._matrix, vec)
+        n = scores.shape[0]
+        if n == 0 or k <= 0:
+            return []
+        if k < n:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(n)
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self._ids[i], round(float(scores[i]), 2)) for i in top]
+
+    def scores_for(self, vec: Dict[str, list], job_ids: List[str]) -> Dict[str, float]:
+        """Scores of `vec` against the given jobs; ids not in the index are left out."""
+        if not job_ids:
+            return {}
+        self._compact()
+        positions = {job_id: i for i, job_id in enumerate(self._ids)}
+        rows = [(job_id, positions[job_id]) for job_id in job_ids if job_id in positions]
+        if not rows:
+            return {}
+        scores = score_matrix(self._matrix[[i for _, i in rows]], vec)
+        return {job_id: round(float(score), 2) for (job_id, _), score in zip(rows, scores)}
+
+
+job_index = JobIndex()
+
+
+async def fetch_jobs(ids: List[str], projection: Optional[dict] = None) -> Dict[str, dict]:
+    """Fetch jobs by id with a single $in query, keyed by string id."""
+    oids = [ObjectId(i) for i in ids]
+    docs = await db.jobs.find({"_id": {"$in": oids}}, projection).to_list(len(oids))
+    return {str(d["_id"]): d for d in docs}
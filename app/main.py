@@ -1,12 +1,58 @@
-from fastapi import FastAPI, Request
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.db import init_db, close_db
+from fastapi.responses import PlainTextResponse
+from app.db import init_db, close_db, index_status, ping, pool_status
+from app.extraction import extractor
+from app.inference import inference
+from app.job_index import job_index
+from app.passwords import password_hasher
+from app import rollups, skills, storage
+from app.analysis import analysis_queue
+from app.candidates import candidate_index
+from app.job_candidates import job_candidates
+from app.response_cache import jobs_cache
+from app.serialization import default_response_class
 from app.routers import auth, jobs, resume, apply, feedback, admin, chatbot
-from app.config import ALLOWED_ORIGINS
+from app.config import ALLOWED_ORIGINS, settings
+from app.instrumentation import REQUEST_SECONDS, configure_logging, render_prometheus, should_log
 import logging
 
-logging.basicConfig(level=logging.INFO)
-app = FastAPI(title="Resume Analyzer API", version="1.0.0")
+configure_logging(settings.LOG_JSON)
+access_log = logging.getLogger("app.access")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # the Mongo client is created here, inside this worker's event loop
+    await init_db()
+    rollups.start_backfill()
+    extractor.start()
+    await inference.start()
+    job_index.start()
+    jobs_cache.subscribe(job_index.refresh)
+    jobs_cache.start()
+    candidate_index.start()
+    job_candidates.start()
+    analysis_queue.start()
+    storage.start_migration()
+    skills.start_migration()
+    yield
+    await analysis_queue.stop()
+    await job_candidates.stop()
+    await jobs_cache.stop()
+    await inference.close()
+    extractor.shutdown()
+    password_hasher.shutdown()
+    await close_db()
+
+app = FastAPI(
+    title="Resume Analyzer API",
+    version="1.0.0",
+    lifespan=lifespan,
+    default_response_class=default_response_class(),
+)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,16 +60,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # browsers hide non-safelisted response headers from cross-origin scripts
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
-@app.on_event("startup")
-async def on_startup():
-    await init_db()
-
-@app.on_event("shutdown")
-async def on_shutdown():
-    await close_db()
-
 # Routers
 app.include_router(auth.router)
 app.include_router(jobs.router)
@@ -37,9 +77,41 @@ app.include_router(chatbot.router)
 async def health():
     return {"ok": True}
 
+@app.get("/api/ready")
+async def ready(response: Response):
+    """Readiness: Mongo reachable and indexes built. /api/health stays a liveness check."""
+    mongo_ok = await ping(settings.READY_PING_TIMEOUT_SECONDS)
+    indexes = await index_status() if mongo_ok else {"ready": False, "state": "unknown"}
+    ok = mongo_ok and indexes["ready"]
+    if not ok:
+        response.status_code = 503
+    return {"ok": ok, "mongo": {"ping": mongo_ok, "pool": pool_status()}, "indexes": indexes}
+
+@app.get("/api/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
+
 @app.middleware("http")
-async def log_requests(request: Request, call_next):
-    logging.info(f"Incoming request: {request.method} {request.url}")
-    response = await call_next(request)
-    logging.info(f"Response status: {response.status_code}")
-    return response
+async def time_requests(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        elapsed = time.perf_counter() - start
+        # label by route template, not raw path, to keep series bounded
+        route = request.scope.get("route")
+        path = getattr(route, "path", "unmatched")
+        REQUEST_SECONDS.observe(elapsed, request.method, path, str(status))
+        ms = elapsed * 1000
+        # errors and slow requests are always logged, the rest sampled
+        if status >= 500 or ms >= settings.LOG_SLOW_REQUEST_MS or should_log(settings.LOG_SAMPLE_RATE):
+            access_log.info("request", extra={"fields": {
+                "method": request.method,
+                "route": path,
+                "path": request.url.path,
+                "status": status,
+                "duration_ms": round(ms, 2),
+            }})
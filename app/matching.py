@@ -0,0 +1,93 @@
+# app/matching.py
+import math
+import re
+import zlib
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+from scipy import sparse
+
+# Hashed bag-of-words: every token maps to one of DIM buckets via crc32,
+# which (unlike hash()) is stable across processes and restarts.
+DIM = 1 << 18
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or our that the "
+    "their this to was we were will with you your".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def vectorize(text: str) -> Dict[str, list]:
+    """
+    Turn text into an L2-normalised, sublinear-tf hashed sparse vector.
+    Returned as {"idx": [...], "val": [...]} so it can be stored in Mongo.
+    """
+    counts: Counter = Counter()
+    for tok in tokenize(text):
+        counts[zlib.crc32(tok.encode("utf-8")) & (DIM - 1)] += 1
+    if not counts:
+        return {"idx": [], "val": []}
+    idx = sorted(counts)
+    val = [1.0 + math.log(counts[i]) for i in idx]
+    norm = math.sqrt(sum(v * v for v in val))
+    return {"idx": idx, "val": [round(v / norm, 6) for v in val]}
+
+
+def job_text(job: Dict[str, Any]) -> str:
+    return " ".join([
+        job.get("title", ""),
+        job.get("description", ""),
+        " ".join(job.get("skills", []) or []),
+    ])
+
+
+def doc_vector(doc: Dict[str, Any], text: Optional[str] = None) -> Dict[str, list]:
+    """Stored vector of a job/resume document, computed on the fly for old documents."""
+    vec = doc.get("vector")
+    if vec is not None:
+        return vec
+    return vectorize(text if text is not None else doc.get("text", ""))
+
+
+def to_row(vec: Dict[str, list]) -> sparse.csr_matrix:
+    idx = vec.get("idx", [])
+    return sparse.csr_matrix(
+        (np.asarray(vec.get("val", []), dtype=np.float32), np.asarray(idx, dtype=np.int32), [0, len(idx)]),
+        shape=(1, DIM),
+    )
+
+
+def to_matrix(vecs: Iterable[Dict[str, list]]) -> sparse.csr_matrix:
+    data: List[float] = []
+    indices: List[int] = []
+    indptr = [0]
+    for vec in vecs:
+        indices.extend(vec.get("idx", []))
+        data.extend(vec.get("val", []))
+        indptr.append(len(indices))
+    return sparse.csr_matrix(
+        (np.asarray(data, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+        shape=(len(indptr) - 1, DIM),
+    )
+
+
+def score_matrix(matrix: sparse.csr_matrix, vec: Dict[str, list]) -> np.ndarray:
+    """Cosine score (0-100) of one vector against every row of `matrix`."""
+    if matrix.shape[0] == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.asarray((matrix @ to_row(vec).T).todense()).ravel() * 100.0
+
+
+def cosine_score(a: Dict[str, list], b: Dict[str, list]) -> float:
+    return round(float(score_matrix(to_row(a), b)[0]), 2)
+
+
+def local_scores(resume_text: str, jds: List[str]) -> List[float]:
+    """Score one resume against many JDs in a single sparse multiply."""
+    scores = score_matrix(to_matrix(vectorize(jd) for jd in jds), vectorize(resume_text))
+    return [round(float(s), 2) for s in scores]
@@ -43,14 +43,29 @@ class ResumeUploadOut(BaseModel):
     id: str
     filename: str
     text_excerpt: str
+    pages: Optional[int] = None
+    skills: List[str] = []
     uploaded_at: datetime
     similarity_score: Dict[str, float]  # JD -> similarity %
 
+class ResumeJobOut(BaseModel):
+    id: str
+    status: Literal["queued", "running", "done", "failed"]
+    filename: str
+    created_at: datetime
+    updated_at: datetime
+    error: Optional[str] = None
+    resume: Optional[ResumeUploadOut] = None  # set once status is "done"
+
 # ---------------- Application models ----------------
 class ApplyIn(BaseModel):
     job_id: str
     resume_id: Optional[str] = None
 
+class ApplyBatchIn(BaseModel):
+    job_ids: List[str] = Field(min_length=1, max_length=100)
+    resume_id: Optional[str] = None
+
 class ApplicationOut(BaseModel):
     id: str
     job_id: str
@@ -60,6 +75,11 @@ class ApplicationOut(BaseModel):
     match_score: float
     created_at: datetime
 
+class ApplyBatchOut(BaseModel):
+    applied: List[ApplicationOut]
+    already_applied: List[str]
+    not_found: List[str]
+
 # ---------------- Feedback models ----------------
 class FeedbackIn(BaseModel):
     message: str
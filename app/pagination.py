@@ -0,0 +1,27 @@
+# app/pagination.py
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from bson import ObjectId
+from fastapi import HTTPException
+
+
+# Keyset cursors are "<iso timestamp>_<object id>" of the last item on a page.
+def encode_cursor(ts: datetime, oid: Any) -> str:
+    return f"{ts.isoformat()}_{oid}"
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    try:
+        ts, oid = cursor.rsplit("_", 1)
+        return datetime.fromisoformat(ts), ObjectId(oid)
+    except Exception:
+        raise HTTPException(400, "Invalid cursor")
+
+
+def keyset_filter(field: str, cursor: Optional[str]) -> Dict[str, Any]:
+    """Filter selecting documents strictly after `cursor` in (field, _id) descending order."""
+    if not cursor:
+        return {}
+    ts, oid = decode_cursor(cursor)
+    return {"$or": [{field: {"$lt": ts}}, {field: ts, "_id": {"$lt": oid}}]}
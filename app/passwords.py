@@ -0,0 +1,62 @@
+# app/passwords.py
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.config import settings
+
+
+class HasherBusy(Exception):
+    """Raised when too many hash/verify calls are already queued."""
+
+
+class PasswordHasher:
+    """
+    bcrypt on a dedicated thread pool. bcrypt releases the GIL, so hashing
+    runs in parallel with the event loop instead of blocking it. Work beyond
+    `max_pending` queued calls is rejected immediately.
+    """
+
+    def __init__(self, rounds: int, threads: int, max_pending: int):
+        self.context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        self.threads = max(1, threads)
+        self.max_pending = max(1, max_pending)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending = 0
+        self.rejected = 0
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _run(self, fn: Callable, *args):
+        if self._pending >= self.max_pending:
+            self.rejected += 1
+            raise HasherBusy()
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="bcrypt")
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, password: str, hashed: str) -> bool:
+        return await self._run(self.context.verify, password, hashed)
+
+    async def verify_and_update(self, password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+        """Verify, and return a new hash too when `hashed` uses a different cost than configured."""
+        return await self._run(self.context.verify_and_update, password, hashed)
+
+
+password_hasher = PasswordHasher(
+    rounds=settings.BCRYPT_ROUNDS,
+    threads=settings.PASSWORD_HASH_THREADS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
@@ -0,0 +1,139 @@
+# app/response_cache.py
+import asyncio
+import hashlib
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from pymongo import ReturnDocument
+
+from app.cache import TTLCache
+from app.config import settings
+from app.db import db
+
+logger = logging.getLogger(__name__)
+
+# `cache_versions` holds one counter per cached resource, e.g.
+#   {_id: "jobs", version: 42}
+# Writers bump it; every worker polls it and drops its cached responses
+# when it moves, so no request touches Mongo between changes.
+
+
+class CachedResponse:
+    __slots__ = ("body", "headers", "etag")
+
+    def __init__(self, body: bytes, headers: Optional[Dict[str, str]] = None):
+        headers = headers or {}
+        digest = hashlib.sha1(body)
+        digest.update(repr(sorted(headers.items())).encode("utf-8"))
+        self.body = body
+        self.etag = '"' + digest.hexdigest() + '"'
+        self.headers = {"ETag": self.etag, **headers}
+
+
+class VersionedResponseCache:
+    """
+    Pre-serialized response bodies keyed by request parameters, valid while
+    the resource's version counter is unchanged. Concurrent misses for the
+    same key share one in-flight build.
+    """
+
+    def __init__(self, name: str, max_entries: int, ttl: float, poll_seconds: float):
+        self.name = name
+        self.poll_seconds = poll_seconds
+        self.version: Optional[int] = None
+        self._entries = TTLCache(max_entries, ttl)
+        self._inflight: Dict[Tuple[int, Hashable], asyncio.Task] = {}
+        self._listeners: List[Callable[[], Awaitable[Any]]] = []
+        self._poll_task: Optional[asyncio.Task] = None
+
+    def subscribe(self, callback: Callable[[], Awaitable[Any]]):
+        """Run `callback` whenever another process changes the version."""
+        self._listeners.append(callback)
+
+    def start(self):
+        if self._poll_task is None:
+            self._poll_task = asyncio.create_task(self._poll())
+
+    async def stop(self):
+        if self._poll_task is not None:
+            self._poll_task.cancel()
+            await asyncio.gather(self._poll_task, return_exceptions=True)
+            self._poll_task = None
+
+    async def _poll(self):
+        while True:
+            try:
+                await self.refresh_version()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Polling the %s cache version failed", self.name)
+            await asyncio.sleep(self.poll_seconds)
+
+    async def refresh_version(self):
+        doc = await db.cache_versions.find_one({"_id": self.name})
+        await self._set_version(doc["version"] if doc else 0, notify=True)
+
+    async def bump(self):
+        """Call after every write to the resource."""
+        doc = await db.cache_versions.find_one_and_update(
+            {"_id": self.name}, {"$inc": {"version": 1}}, upsert=True, return_document=ReturnDocument.AFTER
+        )
+        # this process already knows about its own write
+        await self._set_version(doc["version"], notify=False)
+
+    async def _set_version(self, version: int, notify: bool):
+        if version == self.version:
+            return
+        first = self.version is None
+        self.version = version
+        self._entries.clear()
+        if notify and not first:
+            for callback in self._listeners:
+                try:
+                    await callback()
+                except Exception:
+                    logger.exception("%s cache listener failed", self.name)
+
+    async def get(self, key: Hashable, build: Callable[[], Awaitable[CachedResponse]]) -> CachedResponse:
+        if self.version is None:
+            await self.refresh_version()
+        version = self.version
+        hit = self._entries.get((version, key))
+        if hit is not None:
+            return hit
+        task = self._inflight.get((version, key))
+        if task is None:
+            task = asyncio.ensure_future(self._build(version, key, build))
+            # every waiter may have gone; don't log the error as unretrieved
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self._inflight[(version, key)] = task
+        # shielded: a disconnecting client must not cancel other waiters' build
+        return await asyncio.shield(task)
+
+    async def _build(self, version: int, key: Hashable, build: Callable[[], Awaitable[CachedResponse]]) -> CachedResponse:
+        try:
+            value = await build()
+            # a write during the build makes this result stale already
+            if self.version == version:
+                self._entries.set((version, key), value)
+            return value
+        finally:
+            self._inflight.pop((version, key), None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "entries": len(self._entries),
+            "hits": self._entries.hits,
+            "misses": self._entries.misses,
+            "inflight": len(self._inflight),
+        }
+
+
+jobs_cache = VersionedResponseCache(
+    "jobs",
+    max_entries=settings.JOBS_CACHE_MAX_ENTRIES,
+    ttl=settings.JOBS_CACHE_TTL_SECONDS,
+    poll_seconds=settings.JOBS_CACHE_POLL_SECONDS,
+)
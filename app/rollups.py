@@ -0,0 +1,113 @@
+# app/rollups.py
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from pymongo import ReturnDocument
+
+from app.cache import TTLCache
+from app.config import settings
+from app.db import db, claim_task, finish_task
+
+logger = logging.getLogger(__name__)
+
+BACKFILL_VERSION = 1
+
+# One document per UTC day in `daily_stats`, _id "YYYY-MM-DD"
+COUNTERS = ("users", "jobs", "resumes", "applications", "feedback", "feedback_rating_sum")
+
+# collection -> (date field, counters it feeds)
+_SOURCES = {
+    "users": ("created_at", {"users": {"$sum": 1}}),
+    "jobs": ("created_at", {"jobs": {"$sum": 1}}),
+    "resumes": ("uploaded_at", {"resumes": {"$sum": 1}}),
+    "applications": ("created_at", {"applications": {"$sum": 1}}),
+    "feedback": ("created_at", {"feedback": {"$sum": 1}, "feedback_rating_sum": {"$sum": "$rating"}}),
+}
+
+_cache = TTLCache(max_entries=8, ttl=settings.DASHBOARD_CACHE_SECONDS)
+
+
+def day_key(ts: datetime) -> str:
+    return ts.strftime("%Y-%m-%d")
+
+
+async def record(**counts: int):
+    """Increment today's rollup, e.g. record(feedback=1, feedback_rating_sum=4)."""
+    try:
+        await db.daily_stats.update_one({"_id": day_key(datetime.utcnow())}, {"$inc": counts}, upsert=True)
+    except Exception:
+        # a lost increment must not fail the insert that triggered it
+        logger.exception("Failed to update daily_stats with %s", counts)
+
+
+async def backfill():
+    """
+    Add counts of documents older than the backfill's cutoff to daily_stats.
+    Counts are added onto existing day documents, so increments from live
+    traffic survive; newer documents are record()'s job. Sources merged by
+    an interrupted run are skipped on the retry.
+    """
+    progress = await db.rollup_meta.find_one_and_update(
+        {"_id": "backfill_progress"},
+        {"$setOnInsert": {"cutoff": datetime.utcnow(), "done": []}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    for coll, (field, group) in _SOURCES.items():
+        if coll in progress["done"]:
+            continue
+        add = {c: {"$add": [{"$ifNull": [f"${c}", 0]}, f"$$new.{c}"]} for c in group}
+        await db[coll].aggregate([
+            {"$match": {field: {"$type": "date", "$lt": progress["cutoff"]}}},
+            {"$group": {"_id": {"$dateToString": {"format": "%Y-%m-%d", "date": f"${field}"}}, **group}},
+            {"$merge": {"into": "daily_stats", "whenMatched": [{"$set": add}], "whenNotMatched": "insert"}},
+        ]).to_list(None)
+        await db.rollup_meta.update_one({"_id": "backfill_progress"}, {"$addToSet": {"done": coll}})
+    logger.info("daily_stats backfilled")
+
+
+async def _run_backfill():
+    if not await claim_task("rollups", BACKFILL_VERSION, timedelta(hours=1)):
+        return
+    try:
+        await backfill()
+    except Exception as e:
+        await finish_task("rollups", e)
+        logger.exception("daily_stats backfill failed")
+        return
+    await finish_task("rollups")
+
+
+_backfill_task: Optional[asyncio.Task] = None
+
+
+def start_backfill():
+    """Backfill in the background; the dashboard undercounts until it is done."""
+    global _backfill_task
+    if _backfill_task is None:
+        _backfill_task = asyncio.create_task(_run_backfill())
+
+
+async def _totals(since: Optional[datetime] = None) -> Dict[str, int]:
+    match = {"_id": {"$gte": day_key(since)}} if since else {}
+    group: Dict[str, Any] = {"_id": None}
+    group.update({c: {"$sum": f"${c}"} for c in COUNTERS})
+    rows = await db.daily_stats.aggregate([{"$match": match}, {"$group": group}]).to_list(1)
+    row = rows[0] if rows else {}
+    return {c: int(row.get(c, 0) or 0) for c in COUNTERS}
+
+
+async def summary() -> Dict[str, Any]:
+    """All-time and last-30-day totals, read from O(days) rollup documents."""
+    cached = _cache.get("summary")
+    if cached is not None:
+        return cached
+    all_time, last_30 = await asyncio.gather(
+        _totals(),
+        _totals(datetime.utcnow() - timedelta(days=30)),
+    )
+    out = {"all_time": all_time, "last_30": last_30}
+    _cache.set("summary", out)
+    return out
@@ -1,24 +1,24 @@
 
 from fastapi import APIRouter, Depends
-from datetime import datetime, timedelta
-from app.db import db
 from app.security import require_role
+from app import rollups
+from app.extraction import extractor
+from app.cache import resume_cache
+from app.response_cache import jobs_cache
 
 router = APIRouter(prefix="/api/admin", tags=["Admin"])
 
 @router.get("/dashboard", response_model=dict)
-async def dashboard(authed=Depends(lambda: require_role(["admin"]))):
-    users = await db.users.count_documents({})
-    jobs = await db.jobs.count_documents({})
-    resumes = await db.resumes.count_documents({})
-    apps = await db.applications.count_documents({})
-    # Simple 30-day stats
-    since = datetime.utcnow() - timedelta(days=30)
-    apps_last_30 = await db.applications.count_documents({"created_at": {"$gte": since}})
+async def dashboard(authed=Depends(require_role(["admin"]))):
+    stats = await rollups.summary()
+    totals = stats["all_time"]
     return {
-        "users": users,
-        "jobs": jobs,
-        "resumes": resumes,
-        "applications": apps,
-        "applications_last_30": apps_last_30
+        "users": totals["users"],
+        "jobs": totals["jobs"],
+        "resumes": totals["resumes"],
+        "applications": totals["applications"],
+        "applications_last_30": stats["last_30"]["applications"],
+        "extraction": extractor.stats(),
+        "cache": resume_cache.stats(),
+        "jobs_cache": jobs_cache.stats(),
     }
@@ -1,29 +1,36 @@
 # app/routers/apply.py
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Response
 from datetime import datetime
+from typing import Optional
 from bson import ObjectId
-from app.db import db
-from app.models import ApplyIn, ApplicationOut
-from app.security import get_current_user
-import re
+from app.db import db, read_db
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from app.models import ApplyIn, ApplyBatchIn, ApplyBatchOut, ApplicationOut
+from app.security import get_current_user, get_token_claims
+from app.utils import score_resume_against_jds
+from app.matching import cosine_score, doc_vector, job_text, score_matrix, to_matrix
+from app.job_index import fetch_jobs
+from app.config import settings
+from app.pagination import encode_cursor, keyset_filter
+from app.storage import text_of
+from app.serialization import trusted_json
+from app import rollups
 
 router = APIRouter(prefix="/api/apply", tags=["Apply"])
 
-# Simple skill match based on resume text words & job description words
+# Resume vs job description score via the batched similarity API
 async def match_score_hf(resume_text: str, job_description: str) -> float:
-    def clean_text(text: str) -> str:
-        text = text.lower()
-        text = re.sub(r"[^\w\s]", "", text)
-        return text
+    scores = await score_resume_against_jds(resume_text, [job_description])
+    return scores.get(job_description, 0.0)
 
-    resume_clean = clean_text(resume_text)
-    job_clean = clean_text(job_description)
-
-    r_words = set(resume_clean.split())
-    j_words = set(job_clean.split())
-
-    inter = len(r_words & j_words)
-    return round(100.0 * inter / max(1, len(j_words)), 2)
+async def _load_resume(user_id: str, resume_id: Optional[str] = None) -> dict:
+    if resume_id:
+        resume = await db.resumes.find_one({"_id": ObjectId(resume_id), "user_id": user_id})
+    else:
+        resume = await db.resumes.find_one({"user_id": user_id}, sort=[("uploaded_at", -1)])
+    if not resume:
+        raise HTTPException(400, "Upload a resume first")
+    return resume
 
 @router.post("/", response_model=ApplicationOut)
 async def apply_job(payload: ApplyIn, authed=Depends(get_current_user)):
@@ -31,16 +38,13 @@ async def apply_job(payload: ApplyIn, authed=Depends(get_current_user)):
     if not job:
         raise HTTPException(404, "Job not found")
 
-    resume = None
-    if payload.resume_id:
-        resume = await db.resumes.find_one({"_id": ObjectId(payload.resume_id), "user_id": authed["user_id"]})
-    else:
-        resume = await db.resumes.find_one({"user_id": authed["user_id"]}, sort=[("uploaded_at", -1)])
+    resume = await _load_resume(authed["user_id"], payload.resume_id)
 
-    if not resume:
-        raise HTTPException(400, "Upload a resume first")
-
-    score = await match_score_hf(resume.get("text", ""), job.get("description", ""))
+    if settings.HUGGINGFACE_API_KEY:
+        score = await match_score_hf(await text_of(resume), job.get("description", ""))
+    else:
+        # Precomputed vectors: no tokenization on the request path
+        score = cosine_score(doc_vector(resume), doc_vector(job, job_text(job)))
 
     doc = {
         "user_id": authed["user_id"],
@@ -48,7 +52,11 @@ async def apply_job(payload: ApplyIn, authed=Depends(get_current_user)):
         "match_score": score,
         "created_at": datetime.utcnow(),
     }
-    res = await db.applications.insert_one(doc)
+    try:
+        res = await db.applications.insert_one(doc)
+    except DuplicateKeyError:
+        raise HTTPException(409, "Already applied to this job")
+    await rollups.record(applications=1)
 
     return ApplicationOut(
         id=str(res.inserted_id),
@@ -60,21 +68,119 @@ async def apply_job(payload: ApplyIn, authed=Depends(get_current_user)):
         created_at=doc["created_at"]
     )
 
+@router.post("/batch", response_model=ApplyBatchOut)
+async def apply_jobs_batch(payload: ApplyBatchIn, authed=Depends(get_current_user)):
+    user_id = authed["user_id"]
+    job_ids = list(dict.fromkeys(payload.job_ids))
+    valid_ids = [j for j in job_ids if ObjectId.is_valid(j)]
+
+    resume = await _load_resume(user_id, payload.resume_id)
+    jobs = await fetch_jobs(valid_ids, {"title": 1, "company": 1, "location": 1, "description": 1, "skills": 1, "vector": 1})
+    not_found = [j for j in job_ids if j not in jobs]
+
+    # the (user_id, job_id) index answers this without touching documents
+    existing = await db.applications.find(
+        {"user_id": user_id, "job_id": {"$in": list(jobs)}}, {"_id": 0, "job_id": 1}
+    ).to_list(len(jobs))
+    already = {a["job_id"] for a in existing}
+    todo = [jobs[j] for j in job_ids if j in jobs and j not in already]
+
+    if settings.HUGGINGFACE_API_KEY:
+        by_desc = await score_resume_against_jds(await text_of(resume), [j.get("description", "") for j in todo])
+        scores = [by_desc.get(j.get("description", ""), 0.0) for j in todo]
+    else:
+        # resume vector is computed once; all jobs are scored in one sparse multiply
+        raw = score_matrix(to_matrix(doc_vector(j, job_text(j)) for j in todo), doc_vector(resume))
+        scores = [round(float(s), 2) for s in raw]
+
+    now = datetime.utcnow()
+    docs = [
+        {"user_id": user_id, "job_id": str(j["_id"]), "match_score": score, "created_at": now}
+        for j, score in zip(todo, scores)
+    ]
+    failed = set()
+    if docs:
+        try:
+            await db.applications.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # concurrent duplicates are rejected by the unique index
+            for err in e.details.get("writeErrors", []):
+                failed.add(err["index"])
+                if err.get("code") == 11000:
+                    already.add(docs[err["index"]]["job_id"])
+
+    applied = []
+    for i, (job, doc) in enumerate(zip(todo, docs)):
+        if i in failed:
+            continue
+        applied.append(ApplicationOut(
+            id=str(doc["_id"]),
+            job_id=doc["job_id"],
+            job_title=job.get("title", "Unknown"),
+            company=job.get("company", "Unknown"),
+            location=job.get("location", "Unknown"),
+            match_score=doc["match_score"],
+            created_at=doc["created_at"],
+        ))
+    if applied:
+        await rollups.record(applications=len(applied))
+
+    return ApplyBatchOut(
+        applied=applied,
+        already_applied=[j for j in job_ids if j in already],
+        not_found=not_found,
+    )
+
+# One round-trip per page. The localField/foreignField + pipeline form of
+# $lookup (MongoDB 5.0+) keeps the join on the jobs _id index.
+def _applications_pipeline(match: dict, limit: int) -> list:
+    return [
+        {"$match": match},
+        {"$sort": {"created_at": -1, "_id": -1}},
+        {"$limit": limit},
+        {"$addFields": {"job_oid": {"$convert": {"input": "$job_id", "to": "objectId", "onError": None}}}},
+        {"$lookup": {
+            "from": "jobs",
+            "localField": "job_oid",
+            "foreignField": "_id",
+            "pipeline": [{"$project": {"_id": 0, "title": 1, "company": 1, "location": 1}}],
+            "as": "job",
+        }},
+        {"$project": {
+            "job_id": 1,
+            "match_score": 1,
+            "created_at": 1,
+            "job": {"$arrayElemAt": ["$job", 0]},
+        }},
+    ]
+
+def _application_row(a: dict) -> dict:
+    """An aggregated application document in ApplicationOut's shape."""
+    job = a.get("job") or {}
+    return {
+        "id": str(a["_id"]),
+        "job_id": a["job_id"],
+        "job_title": job.get("title", "Unknown"),
+        "company": job.get("company", "Unknown"),
+        "location": job.get("location", "Unknown"),
+        "match_score": float(a.get("match_score", 0)),
+        "created_at": a.get("created_at", datetime.utcnow()),
+    }
+
 @router.get("/me", response_model=list[ApplicationOut])
-async def my_applications(authed=Depends(get_current_user)):
-    cur = db.applications.find({"user_id": authed["user_id"]}).sort("created_at", -1)
-    out = []
-    async for a in cur:
-        job = await db.jobs.find_one({"_id": ObjectId(a["job_id"])})
-        out.append(
-            ApplicationOut(
-                id=str(a["_id"]),
-                job_id=a["job_id"],
-                job_title=job.get("title", "Unknown") if job else "Unknown",
-                company=job.get("company", "Unknown") if job else "Unknown",
-                location=job.get("location", "Unknown") if job else "Unknown",
-                match_score=a.get("match_score", 0),
-                created_at=a.get("created_at", datetime.utcnow())
-            )
-        )
+async def my_applications(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    before: Optional[str] = Query(None, description="Cursor from X-Next-Cursor of the previous page"),
+    authed=Depends(get_token_claims),
+):
+    match = {"user_id": authed["user_id"], **keyset_filter("created_at", before)}
+    docs = await read_db.applications.aggregate(_applications_pipeline(match, limit)).to_list(limit)
+    out = [_application_row(a) for a in docs]
+    headers = {}
+    if len(docs) == limit and "created_at" in docs[-1]:
+        headers["X-Next-Cursor"] = encode_cursor(docs[-1]["created_at"], docs[-1]["_id"])
+    if settings.FAST_JSON:
+        return trusted_json(out, headers)
+    response.headers.update(headers)
     return out
@@ -1,17 +1,22 @@
 from fastapi import APIRouter, Depends
 from app.models import ChatQuery
 from app.security import require_role
-from app.db import db
+from app.candidates import candidate_index, parse_query
 
 router = APIRouter(prefix="/api/chatbot",tags=["Chatbot"])
 
 @router.post("/", response_model=dict)
 async def query_candidates(payload: ChatQuery, authed=Depends(require_role(["admin"]))):
-    q = payload.query.lower()
-    if "top python" in q:
-        cur = db.resumes.find({"skills": "python"}).limit(10)
-        items = []
-        async for r in cur:
-            items.append({"user_id": r["user_id"], "skills": r.get("skills", [])})
-        return {"answer": f"Found {len(items)} candidates mentioning Python", "items": items}
-    return {"answer": "Query not recognized in demo. Try: 'Top Python skill candidates'.", "items": []}
+    parsed = parse_query(payload.query)
+    if not parsed["skills"] and not parsed["location"]:
+        return {"answer": "Query not recognized. Try: 'Top 20 candidates with Python and Kubernetes in Berlin'.", "items": []}
+
+    await candidate_index.ready()
+    hits = await candidate_index.search(parsed["skills"], parsed["location"], parsed["limit"])
+    items = [
+        {"user_id": h["user_id"], "resume_id": str(h["_id"]), "skills": h.get("skills", []), "score": h["score"]}
+        for h in hits
+    ]
+    wanted = " and ".join(parsed["skills"]) or "any skills"
+    where = f" in {' '.join(parsed['location']).title()}" if parsed["location"] else ""
+    return {"answer": f"Found {len(items)} candidates with {wanted}{where}", "items": items}
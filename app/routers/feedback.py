@@ -4,6 +4,9 @@ from datetime import datetime
 from app.db import db
 from app.models import FeedbackIn, FeedbackOut
 from app.security import get_current_user, require_role
+from app import rollups
+from app.config import settings
+from app.serialization import trusted_json
 
 router = APIRouter(prefix="/api/feedback", tags=["Feedback"])
 
@@ -16,22 +19,26 @@ async def submit_feedback(payload: FeedbackIn, authed=Depends(get_current_user))
         "created_at": datetime.utcnow()
     }
     res = await db.feedback.insert_one(doc)
+    await rollups.record(feedback=1, feedback_rating_sum=doc["rating"])
     return {"ok": True, "id": str(res.inserted_id)}
 
+def _feedback_row(f: dict) -> dict:
+    return {"id": str(f["_id"]), "user_id": f["user_id"], "message": f["message"], "rating": int(f["rating"]), "created_at": f["created_at"]}
+
 @router.get("/", response_model=list[FeedbackOut])
-async def list_feedback(authed=Depends(lambda: require_role(["admin"]))):
+async def list_feedback(authed=Depends(require_role(["admin"]))):
     cur = db.feedback.find().sort("created_at",-1).limit(200)
     out = []
     async for f in cur:
-        out.append(FeedbackOut(id=str(f["_id"]), user_id=f["user_id"], message=f["message"], rating=f["rating"], created_at=f["created_at"]))
+        out.append(_feedback_row(f))
+    if settings.FAST_JSON:
+        return trusted_json(out)
     return out
 
 @router.get("/stats", response_model=dict)
-async def feedback_stats(authed=Depends(lambda: require_role(["admin"]))):
-    pipeline = [{"$group": {"_id": None, "avg": {"$avg": "$rating"}, "count": {"$sum": 1}}}]
-    cur = db.feedback.aggregate(pipeline)
-    stats = await cur.to_list(length=1)
-    if not stats:
+async def feedback_stats(authed=Depends(require_role(["admin"]))):
+    totals = (await rollups.summary())["all_time"]
+    count = totals["feedback"]
+    if not count:
         return {"avg": 0, "count": 0}
-    s = stats[0]
-    return {"avg": round(s.get("avg",0),2), "count": s.get("count",0)}
+    return {"avg": round(totals["feedback_rating_sum"] / count, 2), "count": count}
@@ -1,10 +1,22 @@
 # app/routers/jobs.py
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel
-from typing import List
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel, ValidationError, field_validator
+from pymongo.errors import BulkWriteError
+from typing import List, Optional
 from app.db import db
-from app.security import require_role
+from app.security import require_role, get_token_claims
+from app.matching import vectorize, job_text, doc_vector
+from app.job_index import job_index, fetch_jobs
+from app.job_candidates import job_candidates
+from app.response_cache import CachedResponse, jobs_cache
+from app.serialization import dumps
+from app.skills import skill_matcher
+from app.pagination import encode_cursor, keyset_filter
+from app import rollups
+from app.bulk import iter_csv, iter_ndjson, row_error, collect_write_errors
+from app.config import settings
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
@@ -15,18 +27,33 @@ class JobCreate(BaseModel):
     description: str
     skills: List[str]
 
-@router.post("/", response_model=dict)
-async def create_job(payload: JobCreate, user: dict = Depends(require_role(["admin"]))):
-    new_job = {
+    @field_validator("skills")
+    @classmethod
+    def canonical_skills(cls, skills: List[str]) -> List[str]:
+        # "K8s", "kubernetes " -> ["kubernetes"], so skill filters and matching agree
+        return skill_matcher.normalize(skills)
+
+def _job_doc(payload: JobCreate, created_by: str) -> dict:
+    job = {
         "title": payload.title,
         "company": payload.company,
         "location": payload.location,
         "description": payload.description,
         "skills": payload.skills,
         "created_at": datetime.utcnow(),
-        "created_by": user["user_id"],
+        "created_by": created_by,
     }
+    job["vector"] = vectorize(job_text(job))
+    return job
+
+@router.post("/", response_model=dict)
+async def create_job(payload: JobCreate, user: dict = Depends(require_role(["admin"]))):
+    new_job = _job_doc(payload, user["user_id"])
     result = await db.jobs.insert_one(new_job)
+    job_index.add(str(result.inserted_id), new_job["vector"], new_job["created_at"])
+    job_candidates.jobs_added([(str(result.inserted_id), new_job["vector"])])
+    await jobs_cache.bump()
+    await rollups.record(jobs=1)
     return {
         "id": str(result.inserted_id),
         "title": new_job.get("title", "Unknown"),
@@ -38,18 +65,167 @@ async def create_job(payload: JobCreate, user: dict = Depends(require_role(["adm
         "created_by": new_job.get("created_by"),
     }
 
+@router.post("/bulk", response_model=dict)
+async def bulk_create_jobs(request: Request, user: dict = Depends(require_role(["admin"]))):
+    """
+    Import jobs from a streamed NDJSON body, or CSV when Content-Type is
+    text/csv. Rows are validated one by one and written with unordered
+    insert_many batches of BULK_BATCH_SIZE, so memory stays flat.
+    """
+    content_type = request.headers.get("content-type", "")
+    parse = iter_csv if "csv" in content_type else iter_ndjson
+    rows = parse(request.stream(), settings.BULK_MAX_RECORD_BYTES)
+
+    inserted = 0
+    failed = 0
+    errors: List[dict] = []
+    batch: List[dict] = []
+    batch_rows: List[int] = []
+
+    def add_errors(new_errors: List[dict]):
+        nonlocal failed
+        failed += len(new_errors)
+        errors.extend(new_errors[:max(0, settings.BULK_MAX_ERRORS - len(errors))])
+
+    async def flush():
+        nonlocal inserted
+        if not batch:
+            return
+        failed_idx = set()
+        try:
+            await db.jobs.insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            failed_idx = {w["index"] for w in e.details.get("writeErrors", [])}
+            add_errors(collect_write_errors(e.details, batch_rows))
+        ok = [doc for i, doc in enumerate(batch) if i not in failed_idx]
+        for doc in ok:
+            job_index.add(str(doc["_id"]), doc["vector"], doc["created_at"])
+        job_candidates.jobs_added([(str(doc["_id"]), doc["vector"]) for doc in ok])
+        if ok:
+            await jobs_cache.bump()
+        inserted += len(ok)
+        await rollups.record(jobs=len(ok))
+        batch.clear()
+        batch_rows.clear()
+
+    async for n, record in rows:
+        if isinstance(record, Exception):
+            add_errors([row_error(n, record)])
+            continue
+        try:
+            payload = JobCreate.model_validate(record)
+        except ValidationError as e:
+            add_errors([row_error(n, e)])
+            continue
+        batch.append(_job_doc(payload, user["user_id"]))
+        batch_rows.append(n)
+        if len(batch) >= settings.BULK_BATCH_SIZE:
+            await flush()
+    await flush()
+
+    return {"inserted": inserted, "failed": failed, "errors": errors}
+
+JOB_FIELDS = ("title", "company", "location", "description", "skills", "created_at")
+_JOB_DEFAULTS = {"title": "Unknown", "company": "Unknown", "location": "Unknown", "description": "", "skills": []}
+
+def _job_out(j: dict, fields=JOB_FIELDS) -> dict:
+    out = {"id": str(j.get("_id"))}
+    for f in fields:
+        out[f] = j.get(f, _JOB_DEFAULTS.get(f))
+    return out
+
+def _parse_fields(fields: Optional[str]) -> tuple:
+    if not fields:
+        return JOB_FIELDS
+    wanted = tuple(f.strip() for f in fields.split(",") if f.strip() and f.strip() != "id")
+    unknown = [f for f in wanted if f not in JOB_FIELDS]
+    if unknown:
+        raise HTTPException(400, f"Unknown fields: {', '.join(unknown)}")
+    return wanted
+
 @router.get("/", response_model=List[dict])
-async def list_jobs():
-    docs = await db.jobs.find().sort("created_at", -1).to_list(100)
+async def list_jobs(
+    request: Request,
+    limit: int = Query(100, ge=1, le=100),
+    before: Optional[str] = Query(None, description="Cursor from X-Next-Cursor of the previous page"),
+    fields: Optional[str] = Query(None, description="Comma separated subset of job fields, e.g. title,company"),
+    company: Optional[str] = None,
+    location: Optional[str] = None,
+    skill: Optional[str] = None,
+):
+    """
+    Served from a per-process cache of serialized pages; the cache is
+    dropped whenever any worker creates jobs.
+    """
+    wanted = _parse_fields(fields)
+
+    async def build() -> CachedResponse:
+        query = {}
+        if company:
+            query["company"] = company
+        if location:
+            query["location"] = location
+        if skill:
+            query["skills"] = skill_matcher.canonical(skill)
+        query.update(keyset_filter("created_at", before))
+
+        projection = {f: 1 for f in wanted}
+        projection["created_at"] = 1  # needed for the next cursor
+        # primary, not read_db: a lagging secondary would pin a stale page
+        # under the new version until the next job is posted
+        docs = await db.jobs.find(query, projection).sort([("created_at", -1), ("_id", -1)]).limit(limit).to_list(limit)
+        out = [_job_out(j, wanted) for j in docs]
+
+        headers = {}
+        if len(docs) == limit and "created_at" in docs[-1]:
+            headers["X-Next-Cursor"] = encode_cursor(docs[-1]["created_at"], docs[-1]["_id"])
+        return CachedResponse(dumps(out), headers)
+
+    cached = await jobs_cache.get((limit, before, wanted, company, location, skill), build)
+    if cached.etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=cached.headers)
+    return Response(content=cached.body, media_type="application/json", headers=cached.headers)
+
+@router.get("/recommended", response_model=List[dict])
+async def recommended_jobs(k: int = Query(10, ge=1, le=100), authed=Depends(get_token_claims)):
+    resume = await db.resumes.find_one(
+        {"user_id": authed["user_id"]},
+        {"vector": 1, "text": 1},
+        sort=[("uploaded_at", -1)],
+    )
+    if not resume:
+        raise HTTPException(400, "Upload a resume first")
+
+    await job_index.ready()
+    ranked = job_index.top_k(doc_vector(resume), k)
+    jobs = await fetch_jobs([job_id for job_id, _ in ranked], {"vector": 0})
     out = []
-    for j in docs:
-        out.append({
-            "id": str(j.get("_id")),
-            "title": j.get("title", "Unknown"),
-            "company": j.get("company", "Unknown"),
-            "location": j.get("location", "Unknown"),
-            "description": j.get("description", ""),
-            "skills": j.get("skills", []),
-            "created_at": j.get("created_at"),
-        })
+    for job_id, score in ranked:
+        j = jobs.get(job_id)
+        if not j:
+            continue
+        out.append({**_job_out(j), "match_score": score})
     return out
+
+@router.get("/{job_id}/candidates", response_model=dict)
+async def top_candidates(
+    job_id: str,
+    k: int = Query(20, ge=1, le=settings.JOB_CANDIDATES_TOP_K),
+    user: dict = Depends(require_role(["admin"])),
+):
+    """
+    Best-matching candidates for a job, read from the ranking that is
+    maintained as jobs and resumes are added (nothing is scored here).
+    """
+    ranking = await job_candidates.top(job_id)
+    if ranking is None:
+        if not ObjectId.is_valid(job_id) or not await db.jobs.find_one({"_id": ObjectId(job_id)}, {"_id": 1}):
+            raise HTTPException(404, "Job not found")
+        # created moments ago; its first scan has not finished
+        return {"job_id": job_id, "ready": False, "updated_at": None, "candidates": []}
+    return {
+        "job_id": job_id,
+        "ready": ranking["scanned_at"] is not None,
+        "updated_at": ranking["updated_at"],
+        "candidates": ranking["top"][:k],
+    }
@@ -1,64 +1,166 @@
 # app/routers/resume.py
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from starlette.datastructures import UploadFile
 from datetime import datetime
+import os
 from typing import Optional, List
-from app.db import db
-from app.models import ResumeUploadOut
-from app.security import get_current_user
-from app.utils import extract_text_from_pdf, extract_text_from_docx, resume_jd_similarity
+from fastapi.responses import StreamingResponse
+from bson import ObjectId
+from app.db import db, read_db
+from app.models import ResumeUploadOut, ResumeJobOut
+from app.security import get_current_user, get_token_claims
+from app.config import settings
+from app.extraction import spool_upload, UploadTooLarge
+from app.analysis import analysis_queue, DONE, FAILED, TERMINAL
+from app.storage import METADATA_PROJECTION, excerpt_of, text_of
+from app.serialization import trusted_json
 
 router = APIRouter(prefix="/api/resume", tags=["Resume"])
 
-@router.post("/upload", response_model=ResumeUploadOut)
-async def upload_resume(
-    file: UploadFile = File(...),
-    job_descriptions: Optional[List[str]] = Form(None),
-    authed=Depends(get_current_user)
-):
-    content = await file.read()
-    if file.filename.lower().endswith(".pdf"):
-        resume_text = extract_text_from_pdf(content)
-    elif file.filename.lower().endswith(".docx"):
-        resume_text = extract_text_from_docx(content)
-    else:
-        raise HTTPException(400, "Unsupported file type")
-
-    similarities = {}
-    if job_descriptions:
-        for jd in job_descriptions:
-            result = await resume_jd_similarity(resume_text, jd)
-            similarities[jd] = result.get("similarity_score", 0)
-
-    doc = {
-        "user_id": authed["user_id"],
-        "filename": file.filename,
-        "text": resume_text,
-        "uploaded_at": datetime.utcnow()
-    }
-    res = await db.resumes.insert_one(doc)
-    excerpt = (resume_text[:300] + "...") if len(resume_text) > 303 else resume_text
-
-    return ResumeUploadOut(
-        id=str(res.inserted_id),
-        filename=file.filename,
-        text_excerpt=excerpt,
-        uploaded_at=doc["uploaded_at"],
-        similarity_score=similarities
+# room for the job_descriptions fields and multipart framing around the file
+FORM_OVERHEAD_BYTES = 1024 * 1024
+
+async def reject_oversized(request: Request):
+    """
+    413 straight from Content-Length, before the multipart body is parsed
+    (and spooled to disk). spool_upload still enforces the exact limit, e.g.
+    for chunked requests that send no length.
+    """
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > settings.RESUME_MAX_BYTES + FORM_OVERHEAD_BYTES:
+        raise HTTPException(413, f"Resume exceeds {settings.RESUME_MAX_BYTES} bytes")
+
+_UPLOAD_FORM = {
+    "requestBody": {
+        "required": True,
+        "content": {"multipart/form-data": {"schema": {
+            "type": "object",
+            "required": ["file"],
+            "properties": {
+                "file": {"type": "string", "format": "binary"},
+                "job_descriptions": {"type": "array", "items": {"type": "string"}},
+            },
+        }}},
+    },
+}
+
+# The form is read in the handler rather than declared with File()/Form():
+# FastAPI parses declared form bodies before running any dependency.
+@router.post(
+    "/upload",
+    response_model=ResumeJobOut,
+    status_code=202,
+    dependencies=[Depends(reject_oversized)],
+    openapi_extra=_UPLOAD_FORM,
+)
+async def upload_resume(request: Request, authed=Depends(get_current_user)):
+    """
+    Store the upload and queue it for analysis. Poll
+    /api/resume/{id}/status (or stream /api/resume/{id}/events) for the result.
+    """
+    async with request.form() as form:
+        file = form.get("file")
+        if not isinstance(file, UploadFile):
+            raise HTTPException(422, "A resume file is required")
+        job_descriptions = [jd for jd in form.getlist("job_descriptions") if isinstance(jd, str)] or None
+
+        if file.filename.lower().endswith(".pdf"):
+            kind = "pdf"
+        elif file.filename.lower().endswith(".docx"):
+            kind = "docx"
+        else:
+            raise HTTPException(400, "Unsupported file type")
+
+        try:
+            path, digest = await spool_upload(file, settings.RESUME_MAX_BYTES, settings.UPLOAD_CHUNK_SIZE)
+        except UploadTooLarge:
+            raise HTTPException(413, f"Resume exceeds {settings.RESUME_MAX_BYTES} bytes")
+    try:
+        job = await analysis_queue.submit(authed["user_id"], file.filename, kind, path, digest, job_descriptions)
+    finally:
+        os.unlink(path)
+    return _job_out(job)
+
+def _job_out(job: dict, resume: Optional[dict] = None) -> ResumeJobOut:
+    return ResumeJobOut(
+        id=str(job["_id"]),
+        status=job["status"],
+        filename=job.get("filename", "Unknown"),
+        created_at=job["created_at"],
+        updated_at=job.get("updated_at", job["created_at"]),
+        error=job.get("error") if job["status"] == FAILED else None,
+        resume=_resume_out(resume) if resume else None,
     )
 
+def _resume_row(r: dict) -> dict:
+    """A `resumes` metadata document in ResumeUploadOut's shape."""
+    return {
+        "id": str(r["_id"]),
+        "filename": r.get("filename", "Unknown"),
+        "text_excerpt": r.get("excerpt", ""),
+        "pages": r.get("pages"),
+        "skills": r.get("skills", []),
+        "uploaded_at": r.get("uploaded_at", datetime.utcnow()),
+        "similarity_score": {jd: float(score) for jd, score in r.get("similarity_score", {}).items()},
+    }
+
+def _resume_out(r: dict) -> ResumeUploadOut:
+    return ResumeUploadOut(**_resume_row(r))
+
+async def _with_excerpt(r: dict) -> dict:
+    # documents written before the text moved out have no stored excerpt
+    if "excerpt" not in r:
+        r["excerpt"] = excerpt_of(await text_of(r))
+    return r
+
+async def _load_job(job_id: str, user_id: str) -> ResumeJobOut:
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(404, "Resume job not found")
+    job = await db.resume_jobs.find_one({"_id": ObjectId(job_id), "user_id": user_id}, {"job_descriptions": 0})
+    if not job:
+        raise HTTPException(404, "Resume job not found")
+    resume = None
+    if job["status"] == DONE:
+        resume = await db.resumes.find_one({"_id": ObjectId(job["resume_id"])}, METADATA_PROJECTION)
+        if resume:
+            resume = await _with_excerpt(resume)
+    return _job_out(job, resume)
+
+@router.get("/{job_id}/status", response_model=ResumeJobOut)
+async def resume_status(job_id: str, authed=Depends(get_token_claims)):
+    return await _load_job(job_id, authed["user_id"])
+
+@router.get("/{job_id}/events")
+async def resume_events(job_id: str, authed=Depends(get_token_claims)):
+    """Server-sent events: one `status` event per change, ending at done/failed."""
+    first = await _load_job(job_id, authed["user_id"])
+
+    async def stream():
+        current, last = first, None
+        idle = 0.0
+        while True:
+            if current.status != last:
+                last = current.status
+                idle = 0.0
+                yield f"event: status\ndata: {current.model_dump_json()}\n\n"
+                if current.status in TERMINAL:
+                    return
+            elif idle >= 15:
+                idle = 0.0
+                yield ": keep-alive\n\n"
+            # woken early by local workers; other processes are seen on the next poll
+            await analysis_queue.wait_for_change(job_id, settings.ANALYSIS_POLL_SECONDS)
+            idle += settings.ANALYSIS_POLL_SECONDS
+            current = await _load_job(job_id, authed["user_id"])
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
 @router.get("/me", response_model=List[ResumeUploadOut])
-async def my_resumes(authed=Depends(get_current_user)):
-    cur = db.resumes.find({"user_id": authed["user_id"]}).sort("uploaded_at", -1)
+async def my_resumes(authed=Depends(get_token_claims)):
+    cur = read_db.resumes.find({"user_id": authed["user_id"]}, METADATA_PROJECTION).sort("uploaded_at", -1)
     out = []
     async for r in cur:
-        excerpt = (r.get("text", "")[:300] + "...") if len(r.get("text", "")) > 303 else r.get("text", "")
-        out.append(
-            ResumeUploadOut(
-                id=str(r["_id"]),
-                filename=r.get("filename", "Unknown"),
-                text_excerpt=excerpt,
-                uploaded_at=r.get("uploaded_at", datetime.utcnow()),
-                similarity_score=r.get("similarity_score", {})
-            )
-        )
+        out.append(_resume_row(await _with_excerpt(r)))
+    if settings.FAST_JSON:
+        return trusted_json(out)
     return out
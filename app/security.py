@@ -3,24 +3,43 @@ from typing import List, Callable, Dict, Any
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from bson import ObjectId
 
 from app.config import settings
 from app.db import db
+from app.cache import TTLCache
+from app.passwords import password_hasher, HasherBusy
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")  # match router prefix
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 SECRET_KEY = settings.JWT_SECRET
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+# user_id -> user document (without password), shared by all requests in this process
+_user_cache = TTLCache(settings.USER_CACHE_MAX_ENTRIES, settings.USER_CACHE_TTL_SECONDS)
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+def _busy() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many login attempts in progress, try again shortly", headers={"Retry-After": "1"})
+
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    try:
+        return await password_hasher.verify(plain_password, hashed_password)
+    except HasherBusy:
+        raise _busy()
+
+async def verify_and_rehash(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify a password; the second item is a fresh hash when the stored one uses an outdated cost."""
+    try:
+        return await password_hasher.verify_and_update(plain_password, hashed_password)
+    except HasherBusy:
+        raise _busy()
+
+async def hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except HasherBusy:
+        raise _busy()
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
@@ -31,30 +50,55 @@ def create_access_token(data: dict, expires_delta: timedelta | None = None) -> s
     to_encode["exp"] = expire
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
-async def get_current_user(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
+def _decode_user_id(token: str) -> tuple[str, Dict[str, Any]]:
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str | None = payload.get("user_id") or payload.get("sub")
-        if not user_id:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
-
-        try:
-            oid = ObjectId(user_id)
-        except Exception:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid user id in token")
+    except JWTError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
+    user_id: str | None = payload.get("user_id") or payload.get("sub")
+    if not user_id:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
+    return user_id, payload
 
-        user = await db.users.find_one({"_id": oid})
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+def invalidate_user(user_id: str):
+    """Drop a cached user; call after changing a user's role or profile."""
+    _user_cache.pop(user_id)
 
-        # normalize return
-        user["user_id"] = str(user["_id"])
+async def get_current_user(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
+    user_id, _ = _decode_user_id(token)
+    user = _user_cache.get(user_id)
+    if user is not None:
         return user
-    except JWTError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication token")
 
-def require_role(roles: List[str]) -> Callable:
-    async def role_checker(authed: Dict[str, Any] = Depends(get_current_user)) -> Dict[str, Any]:
+    try:
+        oid = ObjectId(user_id)
+    except Exception:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid user id in token")
+
+    user = await db.users.find_one({"_id": oid}, {"password": 0})
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+
+    # normalize return
+    user["user_id"] = str(user["_id"])
+    _user_cache.set(user_id, user)
+    return user
+
+async def get_token_claims(token: str = Depends(oauth2_scheme)) -> Dict[str, Any]:
+    """
+    Trust-claims mode for routes that only need id/email/role: the signed
+    JWT is taken at its word and no user lookup is done. Falls back to
+    get_current_user when AUTH_TRUST_CLAIMS is off.
+    """
+    if not settings.AUTH_TRUST_CLAIMS:
+        return await get_current_user(token)
+    user_id, payload = _decode_user_id(token)
+    return {"user_id": user_id, "email": payload.get("email"), "role": payload.get("role", "user")}
+
+def require_role(roles: List[str], trust_claims: bool = False) -> Callable:
+    dependency = get_token_claims if trust_claims else get_current_user
+
+    async def role_checker(authed: Dict[str, Any] = Depends(dependency)) -> Dict[str, Any]:
         if authed.get("role") not in roles:
             raise HTTPException(status_code=403, detail="Forbidden")
         return authed
@@ -0,0 +1,47 @@
+# app/serialization.py
+import json
+from typing import Any, Dict, Optional, Type
+
+import orjson
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+
+# FAST_JSON mode. List endpoints map Mongo documents to plain dicts of
+# str / number / datetime / ObjectId and hand them to `trusted_json`, which
+# returns a Response: FastAPI passes that through without validating it
+# against response_model or walking it with jsonable_encoder. orjson writes
+# datetimes natively (same ISO format as pydantic) and ObjectIds via _default.
+# Only use it for data this code built itself, never for request input.
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered by orjson; also understands ObjectId."""
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+
+def default_response_class() -> Type[JSONResponse]:
+    return FastJSONResponse if settings.FAST_JSON else JSONResponse
+
+
+def dumps(content: Any) -> bytes:
+    """Compact JSON bytes, through orjson when FAST_JSON is on."""
+    if settings.FAST_JSON:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(jsonable_encoder(content, custom_encoder={ObjectId: str}), separators=(",", ":")).encode("utf-8")
+
+
+def trusted_json(content: Any, headers: Optional[Dict[str, str]] = None) -> FastJSONResponse:
+    """Skip response_model validation for rows built by our own mappers."""
+    return FastJSONResponse(content, headers=headers)
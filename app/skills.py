@@ -0,0 +1,149 @@
+# app/skills.py
+import asyncio
+import json
+import logging
+import os
+import re
+from collections import Counter
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from app.config import settings
+from app.db import db, claim_task, finish_task
+from app.response_cache import jobs_cache
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_VERSION = 1
+
+# The taxonomy (app/data/skills.json) maps each canonical skill to its
+# synonyms:  {"version": 1, "skills": {"kubernetes": ["k8s", "kube"], ...}}
+# Names are matched lower-cased with runs of spaces/hyphens treated alike
+# ("machine-learning" == "machine learning"). All of them are compiled into
+# one regex trie, so a document is scanned once however large the taxonomy is.
+DEFAULT_TAXONOMY = os.path.join(os.path.dirname(__file__), "data", "skills.json")
+
+_SEP_RE = re.compile(r"[\s\-]+")
+# a skill must not be glued to a longer word, a file name, a host name or an e-mail address
+_BEFORE = r"(?<![a-z0-9_+#.@/])"
+_AFTER = r"(?![a-z0-9_+#@]|\.[a-z0-9])"
+
+
+def fold(name: str) -> str:
+    return _SEP_RE.sub(" ", name.lower()).strip()
+
+
+def _trie_pattern(node: dict) -> str:
+    branches = []
+    for ch, child in sorted(node.items()):
+        if ch:
+            # any run of spaces/hyphens/newlines separates the words of a skill
+            branches.append((r"[\s\-]+" if ch == " " else re.escape(ch)) + _trie_pattern(child))
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    # greedy: try the longer alias first, back off to the one ending here
+    return "(?:" + body + ")?" if "" in node else body
+
+
+class SkillMatcher:
+    """Finds taxonomy skills (and their synonyms) in free text."""
+
+    def __init__(self, taxonomy: Dict[str, List[str]]):
+        self.aliases: Dict[str, str] = {}
+        for canonical, synonyms in taxonomy.items():
+            name = " ".join(canonical.lower().split())
+            for alias in [canonical, *synonyms]:
+                self.aliases[fold(alias)] = name
+        trie: dict = {}
+        for alias in self.aliases:
+            node = trie
+            for ch in alias:
+                node = node.setdefault(ch, {})
+            node[""] = {}
+        self._pattern = re.compile(_BEFORE + "(?:" + _trie_pattern(trie) + ")" + _AFTER)
+
+    @classmethod
+    def load(cls, path: str) -> "SkillMatcher":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["skills"])
+
+    def __len__(self) -> int:
+        return len(set(self.aliases.values()))
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Canonical skill -> occurrences in the whole text, most frequent first."""
+        found = Counter(self.aliases[fold(m)] for m in self._pattern.findall(text.lower()))
+        return dict(sorted(found.items(), key=lambda kv: (-kv[1], kv[0])))
+
+    def split(self, text: str) -> Tuple[List[str], str]:
+        """Canonical skills in order of first mention, and the text with them blanked out."""
+        found: List[str] = []
+
+        def take(m: "re.Match") -> str:
+            found.append(self.aliases[fold(m.group())])
+            return " "
+
+        rest = self._pattern.sub(take, text.lower())
+        return list(dict.fromkeys(found)), rest
+
+    def canonical(self, skill: str) -> str:
+        """The taxonomy name of `skill`, or the skill itself (lower-cased) if unknown."""
+        return self.aliases.get(fold(skill), " ".join(skill.lower().split()))
+
+    def normalize(self, skills: Iterable[str]) -> List[str]:
+        """Canonical names of a user-supplied skill list, deduplicated, order kept."""
+        return list(dict.fromkeys(self.canonical(s) for s in skills if s.strip()))
+
+
+skill_matcher = SkillMatcher.load(settings.SKILLS_TAXONOMY_PATH or DEFAULT_TAXONOMY)
+
+
+# ---------------- job skills migration ----------------
+async def normalize_job_skills(batch: int = 500) -> int:
+    """
+    Rewrite `jobs.skills` of jobs posted before skills were normalized
+    ("Python", "K8s") to their canonical names, so the `skill=` filter finds
+    them. Safe to re-run; returns the number of jobs changed.
+    """
+    changed = 0
+    ops: List[UpdateOne] = []
+    async for job in db.jobs.find({"skills.0": {"$exists": True}}, {"skills": 1}):
+        skills = skill_matcher.normalize(s for s in job["skills"] if isinstance(s, str))
+        if skills != job["skills"]:
+            ops.append(UpdateOne({"_id": job["_id"]}, {"$set": {"skills": skills}}))
+        if len(ops) >= batch:
+            await db.jobs.bulk_write(ops, ordered=False)
+            changed += len(ops)
+            ops = []
+    if ops:
+        await db.jobs.bulk_write(ops, ordered=False)
+        changed += len(ops)
+    return changed
+
+
+async def _run_migration():
+    if not await claim_task("job_skills", MIGRATION_VERSION, timedelta(minutes=30)):
+        return
+    try:
+        changed = await normalize_job_skills()
+    except Exception as e:
+        await finish_task("job_skills", e)
+        logger.exception("Normalizing job skills failed")
+        return
+    await finish_task("job_skills")
+    if changed:
+        logger.info("Normalized the skills of %d jobs", changed)
+        # cached listings still hold the raw names
+        await jobs_cache.bump()
+
+
+_migration_task: Optional[asyncio.Task] = None
+
+
+def start_migration():
+    global _migration_task
+    if _migration_task is None:
+        _migration_task = asyncio.create_task(_run_migration())
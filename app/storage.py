@@ -0,0 +1,180 @@
+# app/storage.py
+import asyncio
+import hashlib
+import logging
+import os
+import tempfile
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+import aiofiles
+import zstandard
+from bson import Binary, ObjectId
+from gridfs.errors import FileExists
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+from pymongo.errors import DuplicateKeyError
+
+from app.config import settings
+from app.db import db, database, claim_task, finish_task
+from app.matching import vectorize
+
+logger = logging.getLogger(__name__)
+
+# Resume storage is split three ways:
+#   originals  GridFS bucket `resume_files`, zstd-compressed, one file per
+#              content hash (metadata.sha256)
+#   full text  `resume_texts` {_id: text_id, text: zstd bytes, chars}
+#   metadata   `resumes` documents: excerpt, pages, skills, vector, scores
+#              and the ids pointing at the two above
+# Documents written before the split still carry an inline `text`.
+BUCKET = "resume_files"
+ZSTD = "zstd"
+EXCERPT_CHARS = 300
+MIGRATION_VERSION = 1
+
+# what list/status endpoints read; never the text or the vector
+METADATA_PROJECTION = {
+    "user_id": 1,
+    "filename": 1,
+    "excerpt": 1,
+    "pages": 1,
+    "skills": 1,
+    "similarity_score": 1,
+    "content_hash": 1,
+    "text_id": 1,
+    "uploaded_at": 1,
+}
+
+
+def excerpt_of(text: str) -> str:
+    return (text[:EXCERPT_CHARS] + "...") if len(text) > EXCERPT_CHARS + 3 else text
+
+
+def _bucket() -> AsyncIOMotorGridFSBucket:
+    return AsyncIOMotorGridFSBucket(database(), bucket_name=BUCKET)
+
+
+# ---------------- Original files ----------------
+async def _find_original(digest: str) -> Optional[ObjectId]:
+    doc = await db[f"{BUCKET}.files"].find_one({"metadata.sha256": digest, "metadata.encoding": ZSTD}, {"_id": 1})
+    return doc["_id"] if doc else None
+
+
+async def store_original(path: str, filename: str, digest: str) -> ObjectId:
+    """
+    Keep the uploaded file, zstd-compressed. Identical bytes are stored
+    once; the unique index on metadata.sha256 settles concurrent uploads.
+    """
+    existing = await _find_original(digest)
+    if existing is not None:
+        return existing
+    file_id = ObjectId()
+    metadata = {"sha256": digest, "encoding": ZSTD, "size": os.path.getsize(path)}
+    cctx = zstandard.ZstdCompressor(level=settings.RESUME_ZSTD_LEVEL)
+    try:
+        with open(path, "rb") as f, cctx.stream_reader(f) as compressed:
+            await _bucket().upload_from_stream_with_id(file_id, filename, compressed, metadata=metadata)
+    except (DuplicateKeyError, FileExists):
+        # another upload of the same bytes won (GridFS reports the unique
+        # index violation as FileExists); drop our chunks and use theirs
+        await db[f"{BUCKET}.chunks"].delete_many({"files_id": file_id})
+        return await _find_original(digest)
+    return file_id
+
+
+async def fetch_original(file_id: ObjectId, suffix: str) -> str:
+    """Download (and decompress) a stored upload into a temp file; the caller removes it."""
+    fd, path = tempfile.mkstemp(prefix="resume-", suffix=suffix)
+    os.close(fd)
+    try:
+        stream = await _bucket().open_download_stream(file_id)
+        compressed = (stream.metadata or {}).get("encoding") == ZSTD
+        dctx = zstandard.ZstdDecompressor().decompressobj() if compressed else None
+        async with aiofiles.open(path, "wb") as out:
+            while True:
+                chunk = await stream.readchunk()
+                if not chunk:
+                    break
+                await out.write(dctx.decompress(chunk) if dctx else chunk)
+    except BaseException:
+        os.unlink(path)
+        raise
+    return path
+
+
+# ---------------- Full text ----------------
+async def save_text(text_id: str, text: str):
+    blob = zstandard.ZstdCompressor(level=settings.RESUME_ZSTD_LEVEL).compress(text.encode("utf-8"))
+    try:
+        await db.resume_texts.update_one(
+            {"_id": text_id},
+            {"$setOnInsert": {"text": Binary(blob), "encoding": ZSTD, "chars": len(text), "created_at": datetime.utcnow()}},
+            upsert=True,
+        )
+    except DuplicateKeyError:
+        pass  # stored concurrently; content is identical
+
+
+async def load_text(text_id: str) -> Optional[str]:
+    doc = await db.resume_texts.find_one({"_id": text_id}, {"text": 1})
+    if not doc:
+        return None
+    return zstandard.ZstdDecompressor().decompress(doc["text"]).decode("utf-8")
+
+
+async def text_of(resume: Dict[str, Any]) -> str:
+    """Full text of a `resumes` document, inline (older documents) or stored separately."""
+    if "text" in resume:
+        return resume["text"] or ""
+    if resume.get("text_id"):
+        return await load_text(resume["text_id"]) or ""
+    # a metadata-only projection of a document that still has its text inline
+    doc = await db.resumes.find_one({"_id": resume["_id"]}, {"text": 1})
+    return (doc or {}).get("text") or ""
+
+
+async def migrate_inline_texts(batch: int = 200):
+    """
+    Move the text of older `resumes` documents into `resume_texts` and give
+    them an excerpt (and a vector if missing). Safe to re-run; reads fall back to inline text meanwhile.
+    """
+    moved = 0
+    while True:
+        docs = await db.resumes.find(
+            {"text": {"$exists": True}}, {"text": 1, "content_hash": 1, "vector": 1}
+        ).to_list(batch)
+        if not docs:
+            break
+        for r in docs:
+            text = r.get("text") or ""
+            text_id = r.get("content_hash") or hashlib.sha256(text.encode("utf-8")).hexdigest()
+            await save_text(text_id, text)
+            update = {"text_id": text_id, "excerpt": excerpt_of(text)}
+            if "vector" not in r:
+                # the text leaves this document, so vectorize it while we have it
+                update["vector"] = vectorize(text)
+            await db.resumes.update_one({"_id": r["_id"]}, {"$set": update, "$unset": {"text": ""}})
+        moved += len(docs)
+    if moved:
+        logger.info("Moved %d inline resume texts to resume_texts", moved)
+
+
+async def _run_migration():
+    if not await claim_task("resume_texts", MIGRATION_VERSION, timedelta(minutes=30)):
+        return
+    try:
+        await migrate_inline_texts()
+    except Exception as e:
+        await finish_task("resume_texts", e)
+        logger.exception("Moving inline resume texts failed")
+        return
+    await finish_task("resume_texts")
+
+
+_migration_task: Optional[asyncio.Task] = None
+
+
+def start_migration():
+    global _migration_task
+    if _migration_task is None:
+        _migration_task = asyncio.create_task(_run_migration())
@@ -1,86 +1,118 @@
-import io
+import asyncio
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union, BinaryIO
 from docx import Document
-import httpx
 from app.config import settings
+from app.inference import inference, CircuitOpen
+from app.instrumentation import HF_FALLBACKS
+from app.matching import local_scores
+
+Source = Union[str, BinaryIO]
+
+logger = logging.getLogger(__name__)
+
+def _fallback_reason(e: Exception) -> str:
+    if isinstance(e, CircuitOpen):
+        return "circuit_open"
+    if isinstance(e, asyncio.TimeoutError):
+        return "timeout"
+    return "error"
 
 # ---------------- PDF/DOCX extraction ----------------
-def extract_text_from_pdf(data: bytes) -> str:
+def iter_pdf_pages(source: Source, max_pages: Optional[int] = None) -> Iterator[str]:
+    """
+    Yield the text of each PDF page in order, dropping pdfplumber's
+    per-page caches so memory stays bounded by a single page.
+    """
     import pdfplumber
-    with io.BytesIO(data) as f:
-        text_all = []
-        with pdfplumber.open(f) as pdf:
-            for page in pdf.pages:
-                text_all.append(page.extract_text() or "")
-        return "\n".join(text_all)
+    with pdfplumber.open(source) as pdf:
+        for i, page in enumerate(pdf.pages):
+            if max_pages is not None and i >= max_pages:
+                break
+            yield page.extract_text() or ""
+            page.flush_cache()
 
-def extract_text_from_docx(data: bytes) -> str:
-    with io.BytesIO(data) as f:
-        doc = Document(f)
-        return "\n".join(p.text for p in doc.paragraphs)
+def iter_docx_paragraphs(source: Source) -> Iterator[str]:
+    doc = Document(source)
+    for p in doc.paragraphs:
+        yield p.text
 
-# ---------------- Named Entity Recognition (NER) via HF API ----------------
-async def extract_job_skills(resume_text: str) -> dict:
+def collect_text(chunks: Iterable[str], max_chars: Optional[int] = None) -> str:
     """
-    Extract job skills from the resume text using Hugging Face API (NER model).
-    Returns extracted skills.
+    Join chunks with newlines, stopping as soon as `max_chars` is reached.
     """
-    if not settings.HUGGINGFACE_API_KEY:
-        return {"skills": []}
+    out = []
+    total = 0
+    for chunk in chunks:
+        if max_chars is not None and total + len(chunk) >= max_chars:
+            out.append(chunk[:max(0, max_chars - total)])
+            break
+        out.append(chunk)
+        total += len(chunk) + 1
+    return "\n".join(out)
 
+def extract_text_from_pdf(source: Source, max_pages: Optional[int] = None, max_chars: Optional[int] = None) -> str:
+    return collect_text(iter_pdf_pages(source, max_pages), max_chars)
+
+def extract_text_from_docx(source: Source, max_chars: Optional[int] = None) -> str:
+    return collect_text(iter_docx_paragraphs(source), max_chars)
+
+# ---------------- Resume & Job Description Similarity (Optional) ----------------
+async def _score_batch(resume_text: str, jds: List[str]) -> Tuple[List[float], bool]:
+    """Scores for one batch, and whether they came from the HF model."""
+    payload = {
+        "inputs": {
+            "source_sentence": resume_text[:1000],
+            "sentences": [jd[:1000] for jd in jds]
+        }
+    }
     try:
-        headers = {"Authorization": f"Bearer {settings.HUGGINGFACE_API_KEY}"}
-        payload = {"inputs": resume_text[:1000]}  # Pass resume text for NER processing
+        data = await inference.post(settings.HF_SIMILARITY_MODEL, payload)
+        scores = [float(item["score"] if isinstance(item, dict) else item) for item in data]
+        if len(scores) != len(jds):
+            raise ValueError(f"expected {len(jds)} scores, got {len(scores)}")
+        return [round(s * 100, 2) for s in scores], True
+    except Exception as e:
+        # Fallback to the local vector matcher
+        HF_FALLBACKS.inc("similarity", _fallback_reason(e), amount=len(jds))
+        logger.warning("Similarity inference failed for %d JDs: %r", len(jds), e)
+        return local_scores(resume_text, jds), False
 
-        async with httpx.AsyncClient(timeout=20) as client:
-            response = await client.post(
-                "https://api-inference.huggingface.co/models/dbmdz/bert-large-cased-finetuned-conll03-english",
-                headers=headers,
-                json=payload
-            )
-            data = response.json()
+async def score_jds_with_source(resume_text: str, jds: List[str]) -> Tuple[Dict[str, float], Set[str]]:
+    """
+    Score one resume against many job descriptions.
+    JDs are sent to the sentence-similarity model in batches of
+    HF_BATCH_SIZE, so N descriptions cost ceil(N / HF_BATCH_SIZE) requests.
+    Returns JD text -> similarity score 0-100, and the JDs the model scored;
+    the rest fell back to the local matcher.
+    """
+    unique = list(dict.fromkeys(jds))
+    if not unique:
+        return {}, set()
+    if not settings.HUGGINGFACE_API_KEY:
+        HF_FALLBACKS.inc("similarity", "no_api_key", amount=len(unique))
+        return dict(zip(unique, local_scores(resume_text, unique))), set()
 
-            # Extract the job skills (entities) from the response
-            skills = [entity['word'] for entity in data if entity['entity'] == 'B-JobSkill']
-            return {"skills": skills}
+    size = max(1, settings.HF_BATCH_SIZE)
+    batches = [unique[i:i + size] for i in range(0, len(unique), size)]
+    results = await asyncio.gather(*(_score_batch(resume_text, b) for b in batches))
+    out = {}
+    from_model = set()
+    for batch, (scores, ok) in zip(batches, results):
+        out.update(zip(batch, scores))
+        if ok:
+            from_model.update(batch)
+    return out, from_model
 
-    except Exception as e:
-        print(f"Error during inference: {e}")
-        return {"skills": []}
+async def score_resume_against_jds(resume_text: str, jds: List[str]) -> Dict[str, float]:
+    """JD text -> similarity score 0-100; see score_jds_with_source."""
+    scores, _ = await score_jds_with_source(resume_text, jds)
+    return scores
 
-# ---------------- Resume & Job Description Similarity (Optional) ----------------
 async def resume_jd_similarity(resume_text: str, job_description: str) -> dict:
     """
     Compute semantic similarity between resume and job description using Hugging Face API.
     Returns similarity score 0-100.
     """
-    if not settings.HUGGINGFACE_API_KEY:
-        resume_words = set(resume_text.lower().split())
-        jd_words = set(job_description.lower().split())
-        inter = len(resume_words & jd_words)
-        score = round(100 * inter / max(1, len(jd_words)), 2)
-        return {"similarity_score": score}
-
-    try:
-        headers = {"Authorization": f"Bearer {settings.HUGGINGFACE_API_KEY}"}
-        payload = {
-            "inputs": {
-                "source_sentence": resume_text[:1000],
-                "sentences": [job_description[:1000]]
-            }
-        }
-        async with httpx.AsyncClient(timeout=20) as client:
-            response = await client.post(
-                "https://api-inference.huggingface.co/models/dbmdz/bert-large-cased-finetuned-conll03-english",
-                headers=headers,
-                json=payload
-            )
-            data = response.json()
-            score = round(float(data[0]["score"]) * 100, 2)
-            return {"similarity_score": score}
-    except Exception as e:
-        # Fallback simple word overlap
-        resume_words = set(resume_text.lower().split())
-        jd_words = set(job_description.lower().split())
-        inter = len(resume_words & jd_words)
-        score = round(100 * inter / max(1, len(jd_words)), 2)
-        return {"similarity_score": score}
+    scores = await score_resume_against_jds(resume_text, [job_description])
+    return {"similarity_score": scores.get(job_description, 0.0)}
@@ -1,7 +1,27 @@
 import os
 import uvicorn
-from app.main import app
+from app.config import settings, web_concurrency
+
+def main():
+    workers = web_concurrency()
+    # workers inherit this and size their Mongo pool from it
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    uvicorn.run(
+        "app.main:app",
+        host=settings.HOST,
+        port=int(os.environ.get("PORT", 8000)),  # Railway sets PORT dynamically
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        backlog=settings.BACKLOG,
+        timeout_keep_alive=settings.KEEPALIVE_SECONDS,
+        limit_concurrency=settings.LIMIT_CONCURRENCY or None,
+        # on SIGTERM stop accepting, let in-flight requests finish, then run shutdown hooks
+        timeout_graceful_shutdown=settings.GRACEFUL_SHUTDOWN_SECONDS,
+        proxy_headers=True,
+        forwarded_allow_ips="*",
+        access_log=False,  # sampled access logs come from the timing middleware
+    )
 
 if __name__ == "__main__":
-    port = int(os.environ.get("PORT", 8000))  # Railway sets PORT dynamically
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/bench_applications.py
+"""
+/api/apply/me: per-application find_one (old) vs. one $lookup aggregation.
+Needs a real MongoDB; seeds a throwaway database and drops it afterwards.
+
+    MONGO_URI=mongodb://localhost:27017 python -m benchmarks.bench_applications --apps 300
+"""
+import argparse
+import asyncio
+import os
+import uuid
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+from benchmarks import harness
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name in ("find", "aggregate", "getMore"):
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+async def old_my_applications(db, user_id):
+    out = []
+    async for a in db.applications.find({"user_id": user_id}).sort("created_at", -1):
+        job = await db.jobs.find_one({"_id": ObjectId(a["job_id"])})
+        out.append((a["_id"], job.get("title") if job else None))
+    return out
+
+
+async def new_my_applications(db, user_id, limit):
+    from app.routers.apply import _applications_pipeline
+
+    return await db.applications.aggregate(_applications_pipeline({"user_id": user_id}, limit)).to_list(limit)
+
+
+async def seed(db, n_apps):
+    now = datetime.utcnow()
+    jobs = [{"title": f"Job {i}", "company": "Acme", "location": "Remote", "description": "x" * 2000,
+             "created_at": now} for i in range(n_apps)]
+    res = await db.jobs.insert_many(jobs)
+    await db.applications.insert_many([
+        {"user_id": "bench-user", "job_id": str(oid), "match_score": 50.0, "created_at": now - timedelta(minutes=i)}
+        for i, oid in enumerate(res.inserted_ids)
+    ])
+    await db.applications.create_index([("user_id", 1), ("created_at", -1), ("_id", -1)])
+
+
+async def measure(fn, counter, runs):
+    counter.count = 0
+    stats = await harness.run_load(lambda i: fn(), runs)
+    return stats, counter.count // max(1, stats["n"])
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--apps", type=int, default=300)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    mongo_uri = os.environ.get("MONGO_URI", "mongodb://localhost:27017")
+    # app.routers.apply reads Settings; point them at throwaway values
+    harness.configure_env(mongo_uri, None)
+
+    counter = CommandCounter()
+    client = AsyncIOMotorClient(mongo_uri, event_listeners=[counter])
+    db = client[f"bench_{uuid.uuid4().hex[:8]}"]
+    try:
+        await seed(db, args.apps)
+        old, old_trips = await measure(lambda: old_my_applications(db, "bench-user"), counter, args.runs)
+        new, new_trips = await measure(lambda: new_my_applications(db, "bench-user", args.apps), counter, args.runs)
+        print(f"applications={args.apps}")
+        print(f"{harness.format_row('find_one per application', old)}  {old_trips} round-trips")
+        print(f"{harness.format_row('$lookup aggregation', new)}  {new_trips} round-trips")
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
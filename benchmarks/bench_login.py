@@ -0,0 +1,68 @@
+# benchmarks/bench_login.py
+"""
+Login burst: bcrypt verify inline in the event loop (old) vs. the
+PasswordHasher thread pool. Reports wall time for the burst and the worst
+event-loop stall seen by a 10 ms heartbeat, i.e. how long every other
+request would have been frozen.
+
+    python -m benchmarks.bench_login --logins 50 --rounds 12
+"""
+import argparse
+import asyncio
+import time
+
+from passlib.context import CryptContext
+
+from benchmarks import harness
+
+
+async def heartbeat(stop: asyncio.Event, lags: list):
+    interval = 0.01
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        lags.append(time.perf_counter() - start - interval)
+
+
+async def burst(verify, n: int):
+    stop, lags = asyncio.Event(), []
+    hb = asyncio.create_task(heartbeat(stop, lags))
+    await asyncio.sleep(0)
+    stats = await harness.run_load(lambda i: verify(), n, concurrency=n)
+    stop.set()
+    await hb
+    return stats, max(lags, default=0.0)
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    # app.passwords reads Settings; point them at throwaway values
+    harness.configure_env(harness.MONGOMOCK, None)
+    from app.passwords import PasswordHasher
+
+    context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=args.rounds)
+    hashed = context.hash("correct horse battery staple")
+    hasher = PasswordHasher(rounds=args.rounds, threads=args.threads, max_pending=args.logins)
+
+    async def inline_verify():
+        return context.verify("correct horse battery staple", hashed)
+
+    async def pooled_verify():
+        return await hasher.verify("correct horse battery staple", hashed)
+
+    old, old_lag = await burst(inline_verify, args.logins)
+    new, new_lag = await burst(pooled_verify, args.logins)
+    hasher.shutdown()
+
+    print(f"logins={args.logins} rounds={args.rounds} threads={args.threads}")
+    print(f"{harness.format_row('inline in event loop', old)}  worst loop stall {old_lag * 1000:9.1f} ms")
+    print(f"{harness.format_row('PasswordHasher pool', new)}  worst loop stall {new_lag * 1000:9.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
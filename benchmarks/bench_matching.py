@@ -0,0 +1,65 @@
+# benchmarks/bench_matching.py
+"""
+Local matching engine vs. the old per-request set-intersection scorer.
+
+    python -m benchmarks.bench_matching --jobs 10000
+"""
+import argparse
+import random
+import re
+import time
+
+from app.matching import vectorize, to_matrix, score_matrix
+from benchmarks.documents import synthetic_text
+
+
+def old_match_score(resume_text: str, job_description: str) -> float:
+    # the scorer app/routers/apply.py used before the vector engine
+    def clean_text(text: str) -> str:
+        text = text.lower()
+        text = re.sub(r"[^\w\s]", "", text)
+        return text
+
+    r_words = set(clean_text(resume_text).split())
+    j_words = set(clean_text(job_description).split())
+    inter = len(r_words & j_words)
+    return round(100.0 * inter / max(1, len(j_words)), 2)
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--resume-words", type=int, default=800)
+    parser.add_argument("--job-words", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    resume = synthetic_text(rng, args.resume_words)
+    jobs = [synthetic_text(rng, args.job_words) for _ in range(args.jobs)]
+
+    _, t_old = timed(lambda: [old_match_score(resume, jd) for jd in jobs])
+
+    # one-off cost paid at create_job / upload time
+    job_vecs, t_index = timed(lambda: [vectorize(jd) for jd in jobs])
+    matrix, t_matrix = timed(lambda: to_matrix(job_vecs))
+    resume_vec = vectorize(resume)
+
+    # request-path cost: one sparse multiply against every job
+    _, t_new = timed(lambda: score_matrix(matrix, resume_vec))
+
+    print(f"jobs={args.jobs} resume_words={args.resume_words} job_words={args.job_words}")
+    print(f"set-intersection, per request : {t_old * 1000:10.2f} ms")
+    print(f"vector engine, per request    : {t_new * 1000:10.2f} ms  ({t_old / max(t_new, 1e-9):.1f}x)")
+    print(f"vectorize jobs (one-off)      : {t_index * 1000:10.2f} ms")
+    print(f"build matrix (one-off)        : {t_matrix * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
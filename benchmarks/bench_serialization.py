@@ -0,0 +1,213 @@
+# benchmarks/bench_serialization.py
+"""
+Per-endpoint serialization cost of the list endpoints, before and after
+FAST_JSON, on synthetic Mongo documents (no database involved):
+
+    models   the old path: hand-built Pydantic models, response_model
+             validation + jsonable_encoder, JSONResponse
+    orjson   the same, rendered by the orjson default response class
+    trusted  FAST_JSON: mapper rows returned as a Response, no revalidation
+
+list_jobs has no response_model step; it compares json + jsonable_encoder
+with orjson when building its cached body.
+
+    python -m benchmarks.bench_serialization --items 100 --requests 2000
+    python -m benchmarks.bench_serialization --save benchmarks/results/serialization.json
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List
+
+from bson import ObjectId
+
+from benchmarks import harness
+from benchmarks.documents import WORDS, synthetic_text
+
+
+def _now(i: int) -> datetime:
+    # Mongo stores milliseconds; keep the same precision
+    return (datetime.utcnow() - timedelta(minutes=i)).replace(microsecond=(i % 1000) * 1000)
+
+
+def job_docs(rng: random.Random, n: int) -> List[dict]:
+    return [{
+        "_id": ObjectId(),
+        "title": f"Engineer {i}",
+        "company": f"Company {i % 50}",
+        "location": ("Remote", "Berlin", "Paris", "London")[i % 4],
+        "description": synthetic_text(rng, 120),
+        "skills": rng.sample(WORDS, 4),
+        "created_at": _now(i),
+    } for i in range(n)]
+
+
+def application_docs(rng: random.Random, n: int) -> List[dict]:
+    return [{
+        "_id": ObjectId(),
+        "job_id": str(ObjectId()),
+        "match_score": round(rng.random() * 100, 2),
+        "created_at": _now(i),
+        "job": {"title": f"Engineer {i}", "company": f"Company {i % 50}", "location": "Berlin"},
+    } for i in range(n)]
+
+
+def resume_docs(rng: random.Random, n: int) -> List[dict]:
+    return [{
+        "_id": ObjectId(),
+        "filename": f"cv{i}.pdf",
+        "excerpt": synthetic_text(rng, 45),
+        "pages": 2,
+        "skills": rng.sample(WORDS, 8),
+        "similarity_score": {synthetic_text(rng, 6): round(rng.random() * 100, 2) for _ in range(3)},
+        "uploaded_at": _now(i),
+    } for i in range(n)]
+
+
+def feedback_docs(rng: random.Random, n: int) -> List[dict]:
+    return [{
+        "_id": ObjectId(),
+        "user_id": str(ObjectId()),
+        "message": synthetic_text(rng, 30),
+        "rating": rng.randint(1, 5),
+        "created_at": _now(i),
+    } for i in range(n)]
+
+
+# ---------------- The old hand-built models ----------------
+def old_applications(docs: List[dict]) -> list:
+    from app.models import ApplicationOut
+
+    out = []
+    for a in docs:
+        job = a.get("job") or {}
+        out.append(ApplicationOut(
+            id=str(a["_id"]), job_id=a["job_id"], job_title=job.get("title", "Unknown"),
+            company=job.get("company", "Unknown"), location=job.get("location", "Unknown"),
+            match_score=a.get("match_score", 0), created_at=a.get("created_at", datetime.utcnow()),
+        ))
+    return out
+
+
+def old_resumes(docs: List[dict]) -> list:
+    from app.models import ResumeUploadOut
+
+    return [ResumeUploadOut(
+        id=str(r["_id"]), filename=r.get("filename", "Unknown"), text_excerpt=r.get("excerpt", ""),
+        pages=r.get("pages"), skills=r.get("skills", []), uploaded_at=r.get("uploaded_at", datetime.utcnow()),
+        similarity_score=r.get("similarity_score", {}),
+    ) for r in docs]
+
+
+def old_feedback(docs: List[dict]) -> list:
+    from app.models import FeedbackOut
+
+    return [FeedbackOut(
+        id=str(f["_id"]), user_id=f["user_id"], message=f["message"], rating=f["rating"], created_at=f["created_at"],
+    ) for f in docs]
+
+
+def _route(app, path: str):
+    return next(r for r in app.routes if getattr(r, "path", None) == path and "GET" in r.methods)
+
+
+async def _validated(route, content: Any) -> Any:
+    from fastapi.routing import serialize_response
+
+    return await serialize_response(field=route.response_field, response_content=content)
+
+
+async def run(args) -> Dict[str, harness.Stats]:
+    from fastapi.responses import JSONResponse
+
+    from app.config import settings
+    from app.main import app
+    from app.routers.apply import _application_row
+    from app.routers.feedback import _feedback_row
+    from app.routers.jobs import JOB_FIELDS, _job_out
+    from app.routers.resume import _resume_row
+    from app.serialization import FastJSONResponse, dumps, trusted_json
+
+    rng = random.Random(args.seed)
+    endpoints = {
+        "my_applications": ("/api/apply/me", application_docs(rng, args.items), old_applications, _application_row),
+        "my_resumes": ("/api/resume/me", resume_docs(rng, args.items), old_resumes, _resume_row),
+        "list_feedback": ("/api/feedback/", feedback_docs(rng, args.items), old_feedback, _feedback_row),
+    }
+    cases: Dict[str, Callable[[], Any]] = {}
+
+    for name, (path, docs, old, row) in endpoints.items():
+        route = _route(app, path)
+
+        async def models(docs=docs, old=old, route=route):
+            return JSONResponse(await _validated(route, old(docs))).body
+
+        async def orjson_class(docs=docs, old=old, route=route):
+            return FastJSONResponse(await _validated(route, old(docs))).body
+
+        async def trusted(docs=docs, row=row):
+            return trusted_json([row(d) for d in docs]).body
+
+        cases[f"{name}_models"] = models
+        cases[f"{name}_orjson"] = orjson_class
+        cases[f"{name}_trusted"] = trusted
+
+    jobs = job_docs(rng, args.items)
+
+    def jobs_body(fast: bool) -> Callable[[], Any]:
+        async def call():
+            settings.FAST_JSON = fast
+            return dumps([_job_out(j, JOB_FIELDS) for j in jobs])
+        return call
+
+    cases["list_jobs_json"] = jobs_body(False)
+    cases["list_jobs_orjson"] = jobs_body(True)
+
+    # every variant of an endpoint must produce the same JSON
+    bodies: Dict[str, Any] = {}
+    for key, call in cases.items():
+        bodies[key] = json.loads(await call())
+    for name in [*endpoints, "list_jobs"]:
+        variants = [v for k, v in bodies.items() if k.startswith(name + "_")]
+        if any(v != variants[0] for v in variants[1:]):
+            raise SystemExit(f"{name}: variants disagree on the response body")
+
+    results: Dict[str, harness.Stats] = {}
+    for key, call in cases.items():
+        async def once(i, call=call):
+            await call()
+
+        results[key] = await harness.run_load(once, args.requests, concurrency=1, warmup=10)
+        print(harness.format_row(key, results[key]), flush=True)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100, help="documents per response")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--save", help="write results to this JSON baseline")
+    parser.add_argument("--compare", help="compare results with this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    # the app is only imported for its routes and models; nothing connects
+    harness.configure_env(harness.MONGOMOCK, None)
+    results = asyncio.run(run(args))
+
+    if args.save:
+        harness.save_baseline(args.save, results, harness.run_meta({k: v for k, v in vars(args).items() if k not in ("save", "compare")}))
+        print(f"\nbaseline written to {args.save}")
+    if args.compare:
+        regressions = harness.compare(results, harness.load_baseline(args.compare), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
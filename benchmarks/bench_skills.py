@@ -0,0 +1,111 @@
+# benchmarks/bench_skills.py
+"""
+Skill extraction throughput: the compiled regex trie vs. one regex per
+alias, on a corpus of resume-sized documents and on one large document,
+plus how scan time grows with the taxonomy size.
+
+    python -m benchmarks.bench_skills --docs 2000 --words 800 --large-mb 20
+"""
+import argparse
+import random
+import re
+import time
+from typing import Callable, Dict, List
+
+from benchmarks import harness
+
+FILLER = (
+    "led team built designed shipped owned improved reduced latency service platform customers "
+    "years experience senior worked with using across production systems large scale migrated "
+    "the a of and to in for on at by from our their"
+).split()
+
+
+def corpus_words(rng: random.Random, aliases: List[str], n_words: int, skill_ratio: float = 0.1) -> str:
+    out = []
+    for _ in range(n_words):
+        out.append(rng.choice(aliases) if rng.random() < skill_ratio else rng.choice(FILLER))
+    return " ".join(out)
+
+
+def per_alias_counter(matcher) -> Callable[[str], Dict[str, int]]:
+    """
+    The straightforward alternative: scan the text once per alias. Not an
+    exact match for the trie, which takes the longest alias at each spot
+    ("github actions", not also "github").
+    """
+    from app.skills import _AFTER, _BEFORE
+
+    patterns = [
+        (re.compile(_BEFORE + r"[\s\-]+".join(re.escape(w) for w in alias.split(" ")) + _AFTER), name)
+        for alias, name in matcher.aliases.items()
+    ]
+
+    def counts(text: str) -> Dict[str, int]:
+        text = text.lower()
+        found: Dict[str, int] = {}
+        for pattern, name in patterns:
+            n = len(pattern.findall(text))
+            if n:
+                found[name] = found.get(name, 0) + n
+        return found
+
+    return counts
+
+
+def throughput(name: str, fn: Callable[[str], Dict[str, int]], docs: List[str]) -> Dict[str, float]:
+    chars = sum(len(d) for d in docs)
+    start = time.perf_counter()
+    for d in docs:
+        fn(d)
+    took = time.perf_counter() - start
+    row = {"docs": len(docs), "mb": round(chars / 1e6, 2), "seconds": round(took, 3),
+           "docs_per_s": round(len(docs) / took, 1), "mb_per_s": round(chars / 1e6 / took, 2)}
+    print(f"{name:<28} docs={row['docs']:<7} {row['mb']:>8.2f} MB  {row['seconds']:>8.3f} s  "
+          f"{row['docs_per_s']:>10.1f} docs/s  {row['mb_per_s']:>8.2f} MB/s")
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--words", type=int, default=800, help="words per resume-sized document")
+    parser.add_argument("--large-mb", type=float, default=20.0, help="size of the single large document")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    # app.skills reads Settings; point them at throwaway values
+    harness.configure_env(harness.MONGOMOCK, None)
+    from app.skills import SkillMatcher, skill_matcher
+
+    rng = random.Random(args.seed)
+    aliases = list(skill_matcher.aliases)
+    print(f"taxonomy: {len(skill_matcher)} skills, {len(aliases)} names")
+
+    docs = [corpus_words(rng, aliases, args.words) for _ in range(args.docs)]
+    naive = per_alias_counter(skill_matcher)
+    sample = docs[: max(1, args.docs // 10)]
+
+    print("-- resume-sized documents")
+    throughput("trie", skill_matcher.counts, docs)
+    throughput("per_alias (10% of docs)", naive, sample)
+
+    print("-- one large document")
+    words = int(args.large_mb * 1e6 / 8)
+    large = corpus_words(rng, aliases, words)
+    throughput("trie", skill_matcher.counts, [large])
+
+    print("-- taxonomy size (resume-sized documents)")
+    for size in (100, 1000, 10000, 50000):
+        taxonomy = {f"skill{i}": [f"syn{i}", f"alt name {i}"] for i in range(size)}
+        start = time.perf_counter()
+        matcher = SkillMatcher(taxonomy)
+        compiled = time.perf_counter() - start
+        names = list(matcher.aliases)
+        corpus = [corpus_words(rng, names, args.words) for _ in range(min(args.docs, 500))]
+        print(f"{size} skills: compiled in {compiled * 1000:.1f} ms")
+        throughput(f"trie_{size}", matcher.counts, corpus)
+
+
+if __name__ == "__main__":
+    main()
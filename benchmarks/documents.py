@@ -0,0 +1,83 @@
+# benchmarks/documents.py
+"""Synthetic resumes of a given page count, as PDF or DOCX bytes."""
+import io
+import random
+from typing import List
+
+from docx import Document
+from docx.enum.text import WD_BREAK
+
+WORDS = (
+    "python java go rust kubernetes docker aws gcp azure sql mongodb redis kafka spark "
+    "react vue angular typescript fastapi django flask ml nlp pytorch tensorflow pandas "
+    "numpy linux terraform ansible ci cd git agile scrum leadership communication design "
+    "backend frontend fullstack data engineer scientist analyst devops security cloud api"
+).split()
+
+LINES_PER_PAGE = 40
+WORDS_PER_LINE = 12
+
+
+def synthetic_text(rng: random.Random, n_words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(n_words))
+
+
+def page_lines(rng: random.Random) -> List[str]:
+    return [synthetic_text(rng, WORDS_PER_LINE) for _ in range(LINES_PER_PAGE)]
+
+
+def make_pdf(pages: int, seed: int = 7) -> bytes:
+    """A minimal text-only PDF (Helvetica, one content stream per page)."""
+    rng = random.Random(seed)
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    catalog = add(b"")  # filled in once the page tree exists
+    tree = add(b"")
+    font = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    kids = []
+    for _ in range(pages):
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 780 Td"]
+        for line in page_lines(rng):
+            ops.append(f"({line}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        content = add(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        kids.append(add(
+            b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 595 842] "
+            b"/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>" % (tree, font, content)
+        ))
+    objects[catalog - 1] = b"<< /Type /Catalog /Pages %d 0 R >>" % tree
+    objects[tree - 1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        b" ".join(b"%d 0 R" % k for k in kids), len(kids)
+    )
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for n, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % n + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    for off in offsets:
+        out.write(b"%010d 00000 n \n" % off)
+    out.write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, catalog, xref))
+    return out.getvalue()
+
+
+def make_docx(pages: int, seed: int = 7) -> bytes:
+    """A DOCX with `pages` page-break separated blocks of paragraphs."""
+    rng = random.Random(seed)
+    doc = Document()
+    for p in range(pages):
+        for line in page_lines(rng):
+            doc.add_paragraph(line)
+        if p < pages - 1:
+            doc.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
@@ -0,0 +1,237 @@
+# benchmarks/harness.py
+"""
+Shared benchmark plumbing: latency summaries, a bounded-concurrency load
+loop, JSON baselines, and an in-process copy of the app wired to a
+throwaway Mongo (mongomock-motor or a real mongod) and the stub HF server.
+"""
+import asyncio
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence
+
+import httpx
+
+MONGOMOCK = "mongomock"
+
+Stats = Dict[str, float]
+
+
+# ---------------- Latency summaries ----------------
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted sequence."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, min(len(sorted_values), math.ceil(q / 100 * len(sorted_values))))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies: Sequence[float], wall: float, errors: int = 0) -> Stats:
+    values = sorted(latencies)
+    return {
+        "n": len(values),
+        "errors": errors,
+        "rps": round(len(values) / wall, 2) if wall > 0 else 0.0,
+        "p50_ms": round(percentile(values, 50) * 1000, 3),
+        "p95_ms": round(percentile(values, 95) * 1000, 3),
+        "p99_ms": round(percentile(values, 99) * 1000, 3),
+        "max_ms": round((values[-1] if values else 0.0) * 1000, 3),
+    }
+
+
+def format_row(name: str, stats: Stats) -> str:
+    return (
+        f"{name:<28} n={stats['n']:<6} err={stats['errors']:<4} rps={stats['rps']:>10.1f}  "
+        f"p50={stats['p50_ms']:>9.2f} ms  p95={stats['p95_ms']:>9.2f} ms  p99={stats['p99_ms']:>9.2f} ms"
+    )
+
+
+# ---------------- Load loop ----------------
+async def run_load(
+    fn: Callable[[int], Awaitable[Any]],
+    requests: int,
+    concurrency: int = 1,
+    warmup: int = 0,
+) -> Stats:
+    """
+    Call `fn(i)` `requests` times with at most `concurrency` calls in flight
+    and summarize the per-call latency. A call that raises counts as an
+    error and is left out of the percentiles.
+    """
+    for i in range(warmup):
+        await fn(-1 - i)
+
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            start = time.perf_counter()
+            try:
+                await fn(i)
+            except Exception:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, requests)))))
+    return summarize(latencies, time.perf_counter() - start, errors)
+
+
+def expect(response: httpx.Response, *codes: int) -> httpx.Response:
+    if response.status_code not in (codes or (200,)):
+        raise RuntimeError(f"{response.request.method} {response.request.url.path} -> {response.status_code}: {response.text[:200]}")
+    return response
+
+
+# ---------------- Baselines ----------------
+def save_baseline(path: str, results: Dict[str, Stats], meta: Dict[str, Any]):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"meta": meta, "results": results}, f, indent=2, sort_keys=True)
+
+
+def load_baseline(path: str) -> Dict[str, Stats]:
+    with open(path) as f:
+        return json.load(f)["results"]
+
+
+def compare(results: Dict[str, Stats], baseline: Dict[str, Stats], tolerance: float) -> List[str]:
+    """
+    Print p95/RPS changes against a baseline and return the scenarios whose
+    p95 grew, or RPS dropped, by more than `tolerance` (0.2 = 20%).
+    """
+    regressions = []
+    print(f"\n{'scenario':<28} {'p95 base':>10} {'p95 now':>10} {'change':>8}   {'rps base':>10} {'rps now':>10} {'change':>8}")
+    for name, now in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<28} (no baseline)")
+            continue
+        p95_change = (now["p95_ms"] - base["p95_ms"]) / base["p95_ms"] if base["p95_ms"] else 0.0
+        rps_change = (now["rps"] - base["rps"]) / base["rps"] if base["rps"] else 0.0
+        flag = ""
+        if p95_change > tolerance or rps_change < -tolerance:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(
+            f"{name:<28} {base['p95_ms']:>10.2f} {now['p95_ms']:>10.2f} {p95_change:>+8.1%}   "
+            f"{base['rps']:>10.1f} {now['rps']:>10.1f} {rps_change:>+8.1%}{flag}"
+        )
+    return regressions
+
+
+def run_meta(args: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "created_at": datetime.utcnow().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "args": args,
+    }
+
+
+# ---------------- Stub Hugging Face server ----------------
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def stub_hf(latency_ms: float) -> Iterator[str]:
+    """Run benchmarks.stub_hf in a subprocess; yields its base URL."""
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.stub_hf", "--port", str(port), "--latency-ms", str(latency_ms)],
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + 15
+        while True:
+            try:
+                httpx.get(f"{base}/health", timeout=0.5).raise_for_status()
+                break
+            except httpx.HTTPError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("stub HF server did not start")
+                time.sleep(0.1)
+        yield base
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+
+# ---------------- App under test ----------------
+def configure_env(mongo: str, hf_base: Optional[str]) -> str:
+    """
+    Point the app's Settings at the benchmark backends. Must run before
+    anything under `app` is imported; returns the database name used.
+    """
+    if "app.config" in sys.modules:
+        raise RuntimeError("configure_env() must be called before importing the app")
+    db_name = f"bench_{uuid.uuid4().hex[:8]}"
+    os.environ["MONGO_URI"] = "mongodb://localhost:27017" if mongo == MONGOMOCK else mongo
+    os.environ["DB_NAME"] = db_name
+    os.environ.setdefault("JWT_SECRET", "bench-secret")
+    os.environ.setdefault("ADMIN_EMAIL", "admin@bench.example.com")
+    os.environ.setdefault("ADMIN_PASSWORD", "bench-admin")
+    os.environ.setdefault("LOG_SAMPLE_RATE", "0")
+    if hf_base:
+        os.environ["HF_API_BASE"] = hf_base
+        os.environ["HUGGINGFACE_API_KEY"] = "bench"
+    else:
+        os.environ["HUGGINGFACE_API_KEY"] = ""
+    return db_name
+
+
+def _use_mongomock(db_name: str):
+    from mongomock_motor import AsyncMongoMockClient
+
+    import app.db as app_db
+    # adopted by connect(), so startup keeps this client
+    app_db.connect(AsyncMongoMockClient())
+
+
+@asynccontextmanager
+async def bench_app(mongo: str, db_name: str):
+    """
+    Start the app in-process (startup/shutdown hooks included) and yield an
+    httpx client talking to it over ASGI, plus the database handle.
+    """
+    if mongo == MONGOMOCK:
+        _use_mongomock(db_name)
+    import app.db as app_db
+    from app import rollups
+    from app.main import app
+
+    if mongo == MONGOMOCK:
+        # mongomock has no $merge; mark the rollup backfill lease as done
+        await app_db.db.app_meta.insert_one({"_id": "rollups", "version": rollups.BACKFILL_VERSION, "state": "ready"})
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        try:
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+                yield client, app_db.db
+        finally:
+            if mongo != MONGOMOCK:
+                await app_db.client.drop_database(db_name)
+
+
+def requires_real_mongo(mongo: str, what: str) -> bool:
+    if mongo == MONGOMOCK:
+        print(f"skip {what}: needs a real mongod (--mongo mongodb://...)")
+        return True
+    return False
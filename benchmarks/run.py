@@ -0,0 +1,271 @@
+# benchmarks/run.py
+"""
+End-to-end benchmark suite. Drives the app in-process over ASGI against a
+throwaway database and the stub HF server, prints p50/p95/p99 and RPS per
+scenario, and optionally saves or compares a JSON baseline.
+
+    python -m benchmarks.run                                   # mongomock, every scenario it supports
+    python -m benchmarks.run --mongo mongodb://localhost:27017 --jobs 1000,100000
+    python -m benchmarks.run --only login,list_jobs --save benchmarks/results/baseline.json
+    python -m benchmarks.run --compare benchmarks/results/baseline.json --tolerance 0.2
+
+Scenarios: login, list_jobs, apply_me, upload, extract, match_score.
+`apply_me` ($lookup) and `upload` (GridFS) need a real mongod.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from benchmarks import harness
+from benchmarks.documents import WORDS, make_docx, make_pdf, synthetic_text
+
+SCENARIOS = ("login", "list_jobs", "apply_me", "upload", "extract", "match_score")
+PASSWORD = "correct horse battery staple"
+
+
+def parse_ints(value: str) -> List[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+# ---------------- Seeding ----------------
+async def signup_and_login(client, email: str) -> Dict[str, str]:
+    harness.expect(await client.post("/api/auth/signup", json={"email": email, "password": PASSWORD, "name": "Bench"}))
+    r = harness.expect(await client.post("/api/auth/login", json={"email": email, "password": PASSWORD}))
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+async def ensure_jobs(db, total: int, batch: int = 5000):
+    """Top the jobs collection up to `total` documents."""
+    from app.matching import vectorize
+
+    rng = random.Random(total)
+    # a handful of descriptions keeps seeding 100k jobs cheap
+    templates = [synthetic_text(rng, 120) for _ in range(32)]
+    vectors = [vectorize(t) for t in templates]
+    have = await db.jobs.count_documents({})
+    now = datetime.utcnow()
+    while have < total:
+        docs = []
+        for i in range(have, min(total, have + batch)):
+            t = i % len(templates)
+            docs.append({
+                "title": f"Engineer {i}",
+                "company": f"Company {i % 50}",
+                "location": ("Remote", "Berlin", "Paris", "London")[i % 4],
+                "description": templates[t],
+                "skills": rng.sample(WORDS, 4),
+                "vector": vectors[t],
+                "created_by": "bench",
+                "created_at": now - timedelta(seconds=i),
+            })
+        await db.jobs.insert_many(docs)
+        have += len(docs)
+
+
+# ---------------- Scenarios ----------------
+async def bench_login(client, db, args) -> Dict[str, harness.Stats]:
+    email = "login@bench.example.com"
+    await signup_and_login(client, email)
+
+    async def call(i):
+        harness.expect(await client.post("/api/auth/login", json={"email": email, "password": PASSWORD}))
+
+    return {"login": await harness.run_load(call, args.login_requests, args.concurrency)}
+
+
+async def bench_list_jobs(client, db, args) -> Dict[str, harness.Stats]:
+    out = {}
+    for total in sorted(args.jobs):
+        await ensure_jobs(db, total)
+
+        async def first_page(i):
+            harness.expect(await client.get("/api/jobs/", params={"limit": 100}))
+
+        async def filtered(i):
+            harness.expect(await client.get("/api/jobs/", params={"limit": 20, "location": "Berlin", "fields": "title,company"}))
+
+        out[f"list_jobs_{total}"] = await harness.run_load(first_page, args.requests, args.concurrency, warmup=1)
+        out[f"list_jobs_{total}_filtered"] = await harness.run_load(filtered, args.requests, args.concurrency, warmup=1)
+    return out
+
+
+async def bench_apply_me(client, db, args) -> Dict[str, harness.Stats]:
+    if harness.requires_real_mongo(args.mongo, "apply_me"):
+        return {}
+    headers = await signup_and_login(client, "apply@bench.example.com")
+    me = harness.expect(await client.get("/api/auth/me", headers=headers)).json()
+    await ensure_jobs(db, args.applications)
+    jobs = await db.jobs.find({}, {"_id": 1}).limit(args.applications).to_list(None)
+    now = datetime.utcnow()
+    await db.applications.insert_many([
+        {"user_id": me["id"], "job_id": str(j["_id"]), "resume_id": None, "match_score": 50.0,
+         "created_at": now - timedelta(minutes=i)}
+        for i, j in enumerate(jobs)
+    ])
+
+    async def call(i):
+        harness.expect(await client.get("/api/apply/me", params={"limit": min(500, args.applications)}, headers=headers))
+
+    return {f"apply_me_{args.applications}": await harness.run_load(call, args.requests, args.concurrency, warmup=1)}
+
+
+def _document(kind: str, pages: int, seed: int) -> bytes:
+    return make_pdf(pages, seed) if kind == "pdf" else make_docx(pages, seed)
+
+
+async def bench_upload(client, db, args) -> Dict[str, harness.Stats]:
+    """Time to 202 Accepted, and time until the analysis job is done."""
+    if harness.requires_real_mongo(args.mongo, "upload"):
+        return {}
+    headers = await signup_and_login(client, "upload@bench.example.com")
+    out = {}
+    for kind in ("pdf", "docx"):
+        for pages in args.pages:
+            # distinct seeds so the content-hash cache never short-circuits
+            files = [_document(kind, pages, seed) for seed in range(args.upload_requests)]
+            accepted: List[float] = []
+
+            async def call(i):
+                start = time.perf_counter()
+                r = harness.expect(await client.post(
+                    "/api/resume/upload",
+                    files={"file": (f"cv{i}.{kind}", files[i])},
+                    data={"job_descriptions": ["python backend engineer", "data scientist pandas"]},
+                    headers=headers,
+                ), 202)
+                accepted.append(time.perf_counter() - start)
+                job_id = r.json()["id"]
+                while True:
+                    status = harness.expect(await client.get(f"/api/resume/{job_id}/status", headers=headers)).json()
+                    if status["status"] in ("done", "failed"):
+                        if status["status"] == "failed":
+                            raise RuntimeError(status.get("error"))
+                        return
+                    await asyncio.sleep(0.01)
+
+            done = await harness.run_load(call, args.upload_requests, args.concurrency)
+            out[f"upload_{kind}_{pages}p_done"] = done
+            out[f"upload_{kind}_{pages}p_accepted"] = harness.summarize(accepted, done["n"] / done["rps"] if done["rps"] else 0)
+    return out
+
+
+async def bench_extract(client, db, args) -> Dict[str, harness.Stats]:
+    """The extraction process pool on its own, per document size."""
+    from app.extraction import extractor
+
+    out = {}
+    for kind in ("pdf", "docx"):
+        for pages in args.pages:
+            fd, path = tempfile.mkstemp(suffix=f".{kind}")
+            with os.fdopen(fd, "wb") as f:
+                f.write(_document(kind, pages, seed=pages))
+            try:
+                async def call(i):
+                    await extractor.extract(kind, path)
+
+                out[f"extract_{kind}_{pages}p"] = await harness.run_load(call, args.upload_requests, args.concurrency, warmup=1)
+            finally:
+                os.unlink(path)
+    return out
+
+
+async def bench_match_score(client, db, args) -> Dict[str, harness.Stats]:
+    from app.config import settings
+    from app.routers.apply import match_score_hf
+    from app.utils import score_resume_against_jds
+
+    rng = random.Random(11)
+    resume = synthetic_text(rng, 800)
+    jds = [synthetic_text(rng, 300) for _ in range(args.match_jds)]
+    out = {}
+
+    async def single(i):
+        await match_score_hf(resume, jds[i % len(jds)])
+
+    async def batch(i):
+        await score_resume_against_jds(resume, jds)
+
+    api_key = settings.HUGGINGFACE_API_KEY
+    if api_key:
+        out["match_score_hf"] = await harness.run_load(single, args.requests, args.concurrency, warmup=1)
+        out[f"match_score_hf_batch_{len(jds)}"] = await harness.run_load(batch, max(1, args.requests // 10), args.concurrency)
+    # the local vector matcher every HF failure falls back to
+    settings.HUGGINGFACE_API_KEY = ""
+    try:
+        out["match_score_local"] = await harness.run_load(single, args.requests, args.concurrency, warmup=1)
+        out[f"match_score_local_batch_{len(jds)}"] = await harness.run_load(batch, max(1, args.requests // 10), args.concurrency)
+    finally:
+        settings.HUGGINGFACE_API_KEY = api_key
+    return out
+
+
+RUNNERS = {
+    "login": bench_login,
+    "list_jobs": bench_list_jobs,
+    "apply_me": bench_apply_me,
+    "upload": bench_upload,
+    "extract": bench_extract,
+    "match_score": bench_match_score,
+}
+
+
+async def run(args, db_name: str) -> Dict[str, harness.Stats]:
+    results: Dict[str, harness.Stats] = {}
+    async with harness.bench_app(args.mongo, db_name) as (client, db):
+        for name in args.only:
+            print(f"-- {name}", flush=True)
+            for key, stats in (await RUNNERS[name](client, db, args)).items():
+                print(harness.format_row(key, stats), flush=True)
+                results[key] = stats
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongo", default=harness.MONGOMOCK, help="'mongomock' or a mongodb:// URI (a throwaway database is used and dropped)")
+    parser.add_argument("--only", default=",".join(SCENARIOS), help="comma separated scenarios")
+    parser.add_argument("--no-hf", action="store_true", help="run without the stub HF server (local fallbacks only)")
+    parser.add_argument("--hf-latency-ms", type=float, default=50.0)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--login-requests", type=int, default=40)
+    parser.add_argument("--jobs", type=parse_ints, default=[1000], help="job counts for list_jobs, e.g. 1000,100000")
+    parser.add_argument("--applications", type=int, default=300)
+    parser.add_argument("--pages", type=parse_ints, default=[1, 10, 50])
+    parser.add_argument("--upload-requests", type=int, default=10)
+    parser.add_argument("--match-jds", type=int, default=50)
+    parser.add_argument("--save", help="write results to this JSON baseline")
+    parser.add_argument("--compare", help="compare results with this JSON baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed p95/RPS regression, 0.2 = 20%%")
+    args = parser.parse_args()
+    args.only = [s.strip() for s in args.only.split(",") if s.strip()]
+    unknown = set(args.only) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    if args.no_hf:
+        db_name = harness.configure_env(args.mongo, None)
+        results = asyncio.run(run(args, db_name))
+    else:
+        with harness.stub_hf(args.hf_latency_ms) as hf_base:
+            db_name = harness.configure_env(args.mongo, hf_base)
+            results = asyncio.run(run(args, db_name))
+
+    if args.save:
+        harness.save_baseline(args.save, results, harness.run_meta({k: v for k, v in vars(args).items() if k not in ("save", "compare")}))
+        print(f"\nbaseline written to {args.save}")
+    if args.compare:
+        regressions = harness.compare(results, harness.load_baseline(args.compare), args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
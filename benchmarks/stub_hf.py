@@ -0,0 +1,44 @@
+# benchmarks/stub_hf.py
+"""
+Stand-in for the Hugging Face inference API with a fixed, configurable
+latency, so benchmarks measure our side of the call and never hit the
+network.
+
+    python -m benchmarks.stub_hf --port 8765 --latency-ms 50
+"""
+import argparse
+import asyncio
+import zlib
+
+import uvicorn
+from fastapi import FastAPI, Request
+
+
+def create_app(latency: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/models/{model:path}")
+    async def infer(model: str, request: Request):
+        body = await request.json()
+        await asyncio.sleep(latency)
+        inputs = body.get("inputs") or {}
+        # sentence similarity: one deterministic score per sentence
+        return [(zlib.crc32(s.encode()) % 1000) / 1000 for s in inputs.get("sentences", [])]
+
+    @app.get("/health")
+    async def health():
+        return {"ok": True}
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    args = parser.parse_args()
+    uvicorn.run(create_app(args.latency_ms / 1000), host="127.0.0.1", port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+# test/conftest.py
+import os
+
+# app.config requires these; the unit tests never connect to Mongo
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "test")
+os.environ.setdefault("JWT_SECRET", "test-secret")
+os.environ.setdefault("ADMIN_EMAIL", "admin@test.example.com")
+os.environ.setdefault("ADMIN_PASSWORD", "test-admin")
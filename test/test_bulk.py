@@ -0,0 +1,91 @@
+# test/test_bulk.py
+import asyncio
+from typing import AsyncIterator, List
+
+from app.bulk import iter_csv, iter_lines, iter_ndjson
+
+
+async def _stream(chunks: List[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+def collect(parser, chunks: List[bytes], **kwargs) -> list:
+    async def run():
+        return [item async for item in parser(_stream(chunks), **kwargs)]
+    return asyncio.run(run())
+
+
+def chunked(data: bytes, size: int) -> List[bytes]:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+# ---------------- iter_lines ----------------
+def test_lines_split_across_chunks():
+    assert collect(iter_lines, chunked(b"one\r\ntwo\nthree", 2)) == ["one", "two", "three"]
+
+
+def test_overlong_line_is_skipped_with_one_error():
+    data = b"short\n" + b"x" * 50 + b"\nafter\n"
+    out = collect(iter_lines, chunked(data, 7), max_bytes=10)
+    assert out[0] == "short"
+    assert isinstance(out[1], ValueError) and "exceeds 10 bytes" in str(out[1])
+    assert out[2:] == ["after"]
+
+
+def test_overlong_line_within_one_chunk():
+    out = collect(iter_lines, [b"a\n" + b"y" * 20 + b"\nb"], max_bytes=10)
+    assert out[0] == "a" and isinstance(out[1], ValueError) and out[2] == "b"
+
+
+# ---------------- iter_ndjson ----------------
+def test_ndjson_rows_are_line_numbers():
+    data = b'{"a": 1}\n\n{bad\n{"a": 2}\n'
+    out = collect(iter_ndjson, chunked(data, 3))
+    assert [n for n, _ in out] == [1, 3, 4]
+    assert out[0][1] == {"a": 1} and out[2][1] == {"a": 2}
+    assert isinstance(out[1][1], ValueError) and str(out[1][1]).startswith("Invalid JSON")
+
+
+def test_ndjson_overlong_record_keeps_numbering():
+    data = b'{"a": 1}\n{"b": "' + b"z" * 40 + b'"}\n{"a": 3}\n'
+    out = collect(iter_ndjson, chunked(data, 5), max_bytes=20)
+    assert [n for n, _ in out] == [1, 2, 3]
+    assert isinstance(out[1][1], ValueError) and out[2][1] == {"a": 3}
+
+
+# ---------------- iter_csv ----------------
+def test_csv_multiline_quoted_field_and_skills():
+    data = b'title,description,skills\nDev,"line one\nline two, with comma",python; k8s|sql\nOps,plain,\n'
+    out = collect(iter_csv, chunked(data, 4))
+    assert [n for n, _ in out] == [1, 2]
+    assert out[0][1] == {"title": "Dev", "description": "line one\nline two, with comma", "skills": ["python", "k8s", "sql"]}
+    assert out[1][1] == {"title": "Ops", "description": "plain", "skills": []}
+
+
+def test_csv_rows_count_records_not_lines():
+    data = b'title,description\nA,"x\ny\nz"\n\nB,b\n'
+    assert [(n, r["title"]) for n, r in collect(iter_csv, [data])] == [(1, "A"), (2, "B")]
+
+
+def test_csv_unterminated_quote_at_end_of_input():
+    out = collect(iter_csv, [b'title,description\nA,a\nB,"never closed\nmore\n'])
+    assert out[0] == (1, {"title": "A", "description": "a"})
+    n, err = out[1]
+    assert n == 2 and isinstance(err, ValueError) and "Unterminated" in str(err)
+
+
+def test_csv_unterminated_quote_gives_up_after_max_bytes():
+    data = b'title,description\nA,"open\n' + b"filler line\n" * 5 + b'B,"closed"\n'
+    out = collect(iter_csv, [data], max_bytes=40)
+    assert out[0][0] == 1
+    assert isinstance(out[0][1], ValueError) and "unterminated quote" in str(out[0][1])
+    # parsing resumes after the abandoned record and numbering carries on
+    assert out[1:] == [(2, {"title": "filler line"}), (3, {"title": "filler line"}), (4, {"title": "B", "description": "closed"})]
+
+
+def test_csv_overlong_line_drops_partial_record():
+    data = b'title,description\nA,"start\n' + b"w" * 60 + b'\nB,b\n'
+    out = collect(iter_csv, chunked(data, 16), max_bytes=30)
+    assert isinstance(out[0][1], ValueError) and out[0][0] == 1
+    assert out[1] == (2, {"title": "B", "description": "b"})
@@ -0,0 +1,83 @@
+# test/test_skills.py
+import pytest
+
+from app.skills import SkillMatcher, skill_matcher
+
+TAXONOMY = {
+    "java": ["jdk"],
+    "javascript": ["js"],
+    "c++": ["cpp"],
+    "git": ["github"],
+    "github actions": [],
+    "ruby": [],
+    "ruby on rails": ["rails"],
+    "react": ["reactjs"],
+    "react native": [],
+    "machine learning": ["ml"],
+    "kubernetes": ["k8s"],
+    "node.js": ["nodejs"],
+}
+
+
+@pytest.fixture(scope="module")
+def matcher() -> SkillMatcher:
+    return SkillMatcher(TAXONOMY)
+
+
+# ---------------- word boundaries ----------------
+@pytest.mark.parametrize("text", [
+    "javascripting",          # java inside a longer word
+    "reactive streams",
+    "see resume.java",        # a file name
+    "mail me at ml@corp.io",  # an e-mail address
+    "docs on k8s.io",         # a host name
+    "cpp_utils and xml",
+])
+def test_no_match_inside_other_words(matcher, text):
+    assert matcher.counts(text) == {}
+
+
+def test_matches_at_punctuation_and_line_edges(matcher):
+    text = "Java, C++ and K8s.\n(react)\nnode.js"
+    assert matcher.counts(text) == {"c++": 1, "java": 1, "kubernetes": 1, "node.js": 1, "react": 1}
+
+
+def test_separators_are_interchangeable(matcher):
+    assert matcher.counts("machine-learning, Machine  learning, machine\nlearning") == {"machine learning": 3}
+
+
+# ---------------- longest alias ----------------
+@pytest.mark.parametrize("text, expected", [
+    ("github actions", {"github actions": 1}),
+    ("github", {"git": 1}),
+    ("ruby on rails", {"ruby on rails": 1}),
+    ("ruby on the side", {"ruby": 1}),
+    ("react native apps", {"react native": 1}),
+    ("react nativex", {"react": 1}),
+])
+def test_longest_alias_wins(matcher, text, expected):
+    assert matcher.counts(text) == expected
+
+
+def test_counts_most_frequent_first(matcher):
+    assert list(matcher.counts("js ruby javascript ruby rails ruby")) == ["ruby", "javascript", "ruby on rails"]
+
+
+# ---------------- canonical names ----------------
+def test_normalize_maps_synonyms_and_dedupes(matcher):
+    assert matcher.normalize(["K8s", "kubernetes ", " ", "Rails", "Unknown  Skill"]) == [
+        "kubernetes", "ruby on rails", "unknown skill"
+    ]
+
+
+def test_split_returns_leftover_text(matcher):
+    skills, rest = matcher.split("Ruby on Rails and machine learning in Berlin")
+    assert skills == ["ruby on rails", "machine learning"]
+    assert rest.split() == ["and", "in", "berlin"]
+
+
+def test_bundled_taxonomy_keeps_frameworks_apart():
+    assert skill_matcher.canonical("Laravel") == "laravel"
+    assert skill_matcher.canonical("MariaDB") == "mariadb"
+    assert skill_matcher.canonical("ASP.NET Core") == "asp.net"
+    assert skill_matcher.canonical("dotnet") == ".net"